@@ -0,0 +1,258 @@
+"""
+Fast, seeded generators of sparse argumentation frameworks
+
+Every generator returns a CSRGraph (see csr_graph.py) on the arguments 0, ..., n - 1,
+built straight from two integer arrays of attack sources and targets, so no networkx
+graph and no per-attack Python tuple is made. All of them take a seed, and the same
+seed gives the same AF. There are no self-attacks unless stated otherwise.
+
+    erdos_renyi       every attack with probability p, by geometric skipping: the gap
+                      to the next attack present is drawn directly, so the cost is
+                      O(n + m) instead of one coin flip for each of the n^2 pairs
+    barabasi_albert   preferential attachment, heavy-tailed degrees
+    watts_strogatz    ring lattice with rewired attacks, small world
+    grid              attacks between neighbours on a rows x cols grid
+
+and in the style of the ICCMA benchmark generators (AFBenchGen2, probo):
+    stable_af         built around planted sets that are stable extensions
+    scc_chain         dense strongly connected components, attacks only from earlier
+                      components to later ones
+    grounded_af       mostly acyclic, so the grounded extension (and with it the admissible
+                      sets built on it) is large
+"""
+
+import math
+import random
+from array import array
+
+from csr_graph import CSRGraph, INDEX_TYPE
+
+# Positions 0 <= k < total, each kept independently with probability p, in increasing order
+def skip_sample(total, p, rng):
+    """
+    Geometric skipping (Batagelj and Brandes 2005): the number of positions skipped before
+    the next kept one is geometric, floor(log(1 - r) / log(1 - p)) for r uniform in [0, 1)
+    """
+    if p <= 0:
+        return
+    if p >= 1:
+        for k in xrange(total):
+            yield k
+        return
+    log_q = math.log(1.0 - p)
+    k = -1
+    while True:
+        k += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        if k >= total:
+            return
+        yield k
+
+# CSRGraph on the arguments 0, ..., n - 1 from index arrays
+def _graph(n, sources, targets):
+    return CSRGraph.from_index_arrays(range(n), sources, targets)
+
+def _rng(seed):
+    return random.Random(seed)
+
+# Erdos-Renyi AF: every attack (u, v), u != v, present with probability p
+def erdos_renyi(n, p, seed = None, self_attacks = False):
+    """
+    With self_attacks the n^2 pairs include (u, u), otherwise there are n (n - 1) pairs:
+    pair k is u = k // (n - 1) attacking the (k % (n - 1))-th argument other than u
+    """
+    rng = _rng(seed)
+    sources = array(INDEX_TYPE)
+    targets = array(INDEX_TYPE)
+    width = n if self_attacks else n - 1
+    if width <= 0:
+        return _graph(n, sources, targets)
+    for k in skip_sample(n * width, p, rng):
+        u, w = divmod(k, width)
+        sources.append(u)
+        targets.append(w if self_attacks or w < u else w + 1)
+    return _graph(n, sources, targets)
+
+# Barabasi-Albert AF: every new argument attacks or is attacked by m earlier ones
+def barabasi_albert(n, m, seed = None):
+    """
+    The m partners of a new argument are chosen with probability proportional to their
+    degree (by sampling from the list of attack endpoints), and each attack between the
+    new argument and a partner points either way with probability 1/2
+    """
+    rng = _rng(seed)
+    sources = array(INDEX_TYPE)
+    targets = array(INDEX_TYPE)
+    # each argument appears once per attack it is in
+    endpoints = array(INDEX_TYPE, range(min(m, n)))
+    for new in xrange(m, n):
+        partners = set()
+        while len(partners) < m:
+            partners.add(endpoints[rng.randrange(len(endpoints))])
+        for old in partners:
+            if rng.random() < 0.5:
+                sources.append(new)
+                targets.append(old)
+            else:
+                sources.append(old)
+                targets.append(new)
+            endpoints.append(old)
+            endpoints.append(new)
+    return _graph(n, sources, targets)
+
+# Watts-Strogatz AF: ring where every argument attacks its k // 2 successors, rewired
+def watts_strogatz(n, k, beta, seed = None):
+    """
+    Every attack is rewired with probability beta to a random target, avoiding
+    self-attacks and repeated attacks
+    """
+    rng = _rng(seed)
+    sources = array(INDEX_TYPE)
+    targets = array(INDEX_TYPE)
+    for u in xrange(n):
+        chosen = set()
+        for step in xrange(1, k // 2 + 1):
+            v = (u + step) % n
+            if rng.random() < beta and n > k // 2 + 1:
+                v = rng.randrange(n)
+                while v == u or v in chosen:
+                    v = rng.randrange(n)
+            if v != u and v not in chosen:
+                chosen.add(v)
+                sources.append(u)
+                targets.append(v)
+    return _graph(n, sources, targets)
+
+# Grid AF: neighbouring arguments attack each other one way or both ways
+def grid(rows, cols, mutual = 0.5, seed = None):
+    """
+    Argument r * cols + c sits at row r and column c. Every pair of horizontal or vertical
+    neighbours attack each other with probability mutual, otherwise one attacks the
+    other, either way with probability 1/2
+    """
+    rng = _rng(seed)
+    sources = array(INDEX_TYPE)
+    targets = array(INDEX_TYPE)
+    for r in xrange(rows):
+        for c in xrange(cols):
+            u = r * cols + c
+            for v in ((u + 1) if c + 1 < cols else None, (u + cols) if r + 1 < rows else None):
+                if v is None:
+                    continue
+                if rng.random() < mutual:
+                    sources.extend(array(INDEX_TYPE, [u, v]))
+                    targets.extend(array(INDEX_TYPE, [v, u]))
+                elif rng.random() < 0.5:
+                    sources.append(u)
+                    targets.append(v)
+                else:
+                    sources.append(v)
+                    targets.append(u)
+    return _graph(rows * cols, sources, targets)
+
+"""
+ICCMA-style generators
+"""
+
+# AF with planted stable extensions
+def stable_af(n, extensions, size, p = 0.0, seed = None):
+    """
+    Input: number of arguments, number of planted sets, their size, probability of extra
+    random attacks between arguments that are in no planted set together
+    Each planted set S gets, for every argument a outside it, an attack on a from a member
+    of S that shares no planted set with a. Attacks never join two members of the same
+    planted set, so every planted set is conflict free, and it is stable unless some
+    argument outside it shares a planted set with all its members
+    """
+    rng = _rng(seed)
+    planted = [rng.sample(xrange(n), min(size, n)) for k in xrange(extensions)]
+    # member_of[a] = indices of the planted sets containing a
+    member_of = [set() for a in xrange(n)]
+    for k, members in enumerate(planted):
+        for a in members:
+            member_of[a].add(k)
+    attacks = set()
+    for members in planted:
+        inside = set(members)
+        for a in xrange(n):
+            if a in inside:
+                continue
+            # a few random tries first, the full scan only if they all fail
+            attacker = None
+            for attempt in xrange(8):
+                s = rng.choice(members)
+                if member_of[s].isdisjoint(member_of[a]):
+                    attacker = s
+                    break
+            if attacker is None:
+                allowed = [s for s in members if member_of[s].isdisjoint(member_of[a])]
+                if allowed:
+                    attacker = rng.choice(allowed)
+            if attacker is not None:
+                attacks.add((attacker, a))
+    sources = array(INDEX_TYPE)
+    targets = array(INDEX_TYPE)
+    for u, v in attacks:
+        sources.append(u)
+        targets.append(v)
+    for k in skip_sample(n * n, p, rng):
+        u, v = divmod(k, n)
+        if u != v and member_of[u].isdisjoint(member_of[v]):
+            sources.append(u)
+            targets.append(v)
+    return _graph(n, sources, targets)
+
+# Chain of dense strongly connected components
+def scc_chain(n, components, p_inside = 0.3, p_forward = 0.05, seed = None):
+    """
+    The arguments are split into components consecutive blocks. Inside a block there is
+    a cycle through all its arguments (so it is strongly connected) plus every attack with
+    probability p_inside; from an argument to any argument of a later block there is an
+    attack with probability p_forward; there are no attacks back to earlier blocks
+    """
+    rng = _rng(seed)
+    sources = array(INDEX_TYPE)
+    targets = array(INDEX_TYPE)
+    components = max(1, min(components, n))
+    bounds = [n * k // components for k in xrange(components + 1)]
+    for b in xrange(components):
+        low, high = bounds[b], bounds[b + 1]
+        width = high - low
+        if width > 1:
+            for u in xrange(low, high):
+                sources.append(u)
+                targets.append(low + (u - low + 1) % width)
+        for k in skip_sample(width * width, p_inside, rng):
+            u, v = divmod(k, width)
+            if u != v and v != (u + 1) % width:
+                sources.append(low + u)
+                targets.append(low + v)
+        # attacks to all later blocks
+        later = n - high
+        for k in skip_sample(width * later, p_forward, rng):
+            u, v = divmod(k, later)
+            sources.append(low + u)
+            targets.append(high + v)
+    return _graph(n, sources, targets)
+
+# Mostly acyclic AF, with a large grounded extension
+def grounded_af(n, p = 0.05, p_back = 0.001, seed = None):
+    """
+    An attack from u to a later argument v > u with probability p, back to an earlier one
+    with probability p_back; with p_back = 0 the AF is acyclic and the grounded extension
+    is its only complete extension
+    """
+    rng = _rng(seed)
+    sources = array(INDEX_TYPE)
+    targets = array(INDEX_TYPE)
+    width = n - 1
+    if width <= 0:
+        return _graph(n, sources, targets)
+    # the n (n - 1) ordered pairs as in erdos_renyi, forward and backward sampled separately
+    for probability, forward in ((p, True), (p_back, False)):
+        for k in skip_sample(n * width, probability, rng):
+            u, w = divmod(k, width)
+            v = w if w < u else w + 1
+            if (v > u) == forward:
+                sources.append(u)
+                targets.append(v)
+    return _graph(n, sources, targets)
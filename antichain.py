@@ -0,0 +1,112 @@
+"""
+Antichains of sets: filtering a collection down to its subset-maximal or subset-minimal sets
+
+Sets are bitmasks (see Absargfw), so "S is a subset of T" is the single test S & T == S.
+The sets kept are bucketed by cardinality: a set can only be strictly inside a larger
+set, so a candidate is only compared with the buckets on one side of its own size, and
+within its own size only an equal set can dominate it, which is a hash lookup.
+
+    maximal_masks / minimal_masks   filter a whole collection at once, largest (smallest)
+                                    sets first, so nothing kept is ever removed again
+    Antichain                       streaming mode: a running antichain, updated as the
+                                    candidates arrive, e.g. straight from a search
+"""
+
+MAXIMAL = "maximal"
+MINIMAL = "minimal"
+
+# Number of set bits of a mask
+def popcount(mask):
+    return bin(mask).count("1")
+
+# The subset-maximal masks of a collection
+def maximal_masks(masks):
+    """
+    Input: an iterable of bitmasks (repeats allowed)
+    Output: the set of those not strictly contained in another one
+    """
+    return _filter(masks, MAXIMAL)
+
+# The subset-minimal masks of a collection
+def minimal_masks(masks):
+    """
+    Input: an iterable of bitmasks (repeats allowed)
+    Output: the set of those not strictly containing another one
+    """
+    return _filter(masks, MINIMAL)
+
+def _filter(masks, keep):
+    by_size = {}
+    for mask in set(masks):
+        by_size.setdefault(popcount(mask), []).append(mask)
+    sizes = sorted(by_size, reverse = keep == MAXIMAL)
+    answer = set()
+    kept = []
+    for size in sizes:
+        # only the masks kept from earlier (strictly larger, resp. smaller) buckets can dominate
+        if keep == MAXIMAL:
+            survivors = [mask for mask in by_size[size] if not any(mask & other == mask for other in kept)]
+        else:
+            survivors = [mask for mask in by_size[size] if not any(mask & other == other for other in kept)]
+        kept.extend(survivors)
+        answer.update(survivors)
+    return answer
+
+class Antichain(object):
+
+    # Empty antichain, keeping the subset-maximal (keep = MAXIMAL) or subset-minimal sets
+    def __init__(self, keep = MAXIMAL):
+        self.keep = keep
+        # cardinality --> set of masks of that cardinality
+        self.buckets = {}
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    def __iter__(self):
+        for size in sorted(self.buckets):
+            for mask in self.buckets[size]:
+                yield mask
+
+    def __contains__(self, mask):
+        return mask in self.buckets.get(popcount(mask), ())
+
+    # Is mask dominated by (equal to or strictly inside / around) a member?
+    def dominated(self, mask):
+        return self._dominated(mask, popcount(mask))
+
+    # Is mask strictly inside / around a member?
+    def strictly_dominated(self, mask):
+        return self._dominated(mask, popcount(mask), strict = True)
+
+    def _dominated(self, mask, size, strict = False):
+        if not strict and mask in self.buckets.get(size, ()):
+            return True
+        for other_size, bucket in self.buckets.items():
+            if self.keep == MAXIMAL and other_size > size:
+                if any(mask & other == mask for other in bucket):
+                    return True
+            elif self.keep == MINIMAL and other_size < size:
+                if any(mask & other == other for other in bucket):
+                    return True
+        return False
+
+    # Offer a candidate, returns True if it joins the antichain
+    def add(self, mask):
+        """
+        A candidate dominated by a member is dropped, otherwise it joins and the members
+        it dominates are removed
+        """
+        size = popcount(mask)
+        if self._dominated(mask, size):
+            return False
+        for other_size in list(self.buckets):
+            bucket = self.buckets[other_size]
+            if self.keep == MAXIMAL and other_size < size:
+                bucket.difference_update([other for other in bucket if mask & other == other])
+            elif self.keep == MINIMAL and other_size > size:
+                bucket.difference_update([other for other in bucket if mask & other == mask])
+            if not bucket:
+                del self.buckets[other_size]
+        self.buckets.setdefault(size, set()).add(mask)
+        return True
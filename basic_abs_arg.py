@@ -18,6 +18,9 @@ Visualisation of AFs, colour in extensions: green for in, red for out, grey for
 # Python modules
 import time
 import random
+from itertools import islice
+from functools import wraps
+from collections import OrderedDict
 from tqdm import tqdm # progress bars
 
 """
@@ -46,21 +49,32 @@ def powerlist(myset):
         answer.append(frozenset(sublist))
     return answer
 
+# Antichain engine: subset-maximal / minimal filtering of bitmasks bucketed by cardinality
+import antichain
+
+# [S1, S2, ..., Sn] --> list of bitmasks, one bit per element occurring in some Si
+def sets_to_masks(mylist):
+    index = {}
+    answer = []
+    for myset in mylist:
+        mask = 0
+        for element in myset:
+            if element not in index:
+                index[element] = len(index)
+            mask |= 1 << index[element]
+        answer.append(mask)
+    return answer
+
 # [S1, S2, ..., Sn] --> max [S1, S2, ..., Sn]
 def find_max_sets(mylist):
     """
     Input: a list of sets
-    Output: the list of subset-maximal sets of that list
-    But there is a more efficient implementation:
-    https://stackoverflow.com/questions/14106121/efficient-algorithm-for-finding-all-maximal-subsets
+    Output: the list of subset-maximal sets of that list, in their original order
+    The sets are compared as bitmasks by the antichain engine
     """
-    non_max_sets = []
-    for myset in mylist:
-        for other_set in mylist:
-            if myset.issubset(other_set) and myset != other_set:
-                non_max_sets.append(myset)
-    answer = [item for item in mylist if item not in non_max_sets]
-    return answer
+    masks = sets_to_masks(mylist)
+    keep = antichain.maximal_masks(masks)
+    return [item for item, mask in zip(mylist, masks) if mask in keep]
 
 # [S1, S2, ..., Sn] --> min [S1, S2, ..., Sn]
 def find_min_sets(mylist):
@@ -68,12 +82,21 @@ def find_min_sets(mylist):
     Input: a list of sets
     Output: the list of minimal sets of that list (dual of the previous)
     """
-    non_min_sets = []
-    for myset in mylist:
-        for other_set in mylist:
-            if other_set.issubset(myset) and myset != other_set:
-                non_min_sets.append(myset)
-    answer = [item for item in mylist if item not in non_min_sets]
+    masks = sets_to_masks(mylist)
+    keep = antichain.minimal_masks(masks)
+    return [item for item, mask in zip(mylist, masks) if mask in keep]
+
+# integer bitmask --> list of the positions of its set bits
+def bit_indices(mask):
+    """
+    Input: an integer >= 0 (a bitmask)
+    Output: the list of indices i such that bit i of mask is set, in increasing order
+    """
+    answer = []
+    while mask:
+        lowest = mask & -mask
+        answer.append(lowest.bit_length() - 1)
+        mask ^= lowest
     return answer
 
 """
@@ -82,61 +105,547 @@ Abstract argumentation frameworks
 
 # Abstract argumentation frameworks are based on directed graphs
 import networkx as nx
+# Native compressed sparse row graphs, which all queries go through
+from csr_graph import CSRGraph
+# Worklist fixpoint engine for grounded semantics and iterating d
+import fixpoint
+# Labelling-based backtracking search for complete, preferred and stable
+import labelling
+# SAT encodings, used with engine = "sat"
+from sat_reasoning import SATReasoner
+# SCC-recursive evaluation, used with engine = "scc"
+import scc
+# Vectorised evaluation of the powerset methods, if numpy is available
+import batch
+# Multi-process enumeration, used with processes > 1 (None for one process per CPU)
+import parallel
+# ICCMA file formats (tgf, apx, i23)
+import iccma_io
+# Sparse random AFs generated straight into CSR form
+import af_generators
+# Odd / even reachability along attacks, for indirect attack, defence and controversy
+import parity
+# Cycle queries through strongly connected components
+import cycle_analysis
+# Searches maximising the range, for semi-stable and stage semantics
+import range_search
+# Graded grounded extensions by attacker counts
+import graded
+# Kernels and grounded reduction, shrinking the AF before enumeration
+import kernel
+
+# Decorator: memoise an Absargfw method in the framework's result cache
+def cached(method):
+    """
+    The result is stored under the method name and its arguments, and a copy is returned
+    so that callers can change lists and sets they are given without corrupting the cache
+    The methods in result_store.PERSISTENT also go through the framework's on-disk store
+    """
+    name = method.__name__
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        profiler = self.profiler
+        if profiler is not None:
+            token = profiler.begin()
+        hit = False
+        try:
+            hit, value = self._cache_lookup(key)
+            persistent = self.store is not None and name in result_store.PERSISTENT
+            if not hit and persistent:
+                hit, value = self.store.get(self._fingerprint(), key)
+                if hit:
+                    self._cache_store(key, value)
+            if not hit:
+                value = method(self, *args, **kwargs)
+                self._cache_store(key, value)
+                # error messages are not worth keeping
+                if persistent and not isinstance(value, str):
+                    self.store.put(self._fingerprint(), key, value)
+        finally:
+            # also when the method raises, so that nesting depths stay right
+            if profiler is not None:
+                profiler.end(token, name, args + tuple(sorted(kwargs.items())), hit)
+        if isinstance(value, (list, set, dict)):
+            return type(value)(value)
+        return value
+    return wrapper
+
+# Results kept on disk between processes, keyed by the fingerprint of the AF
+import result_store
+
+# Call counts and times of the core operators, enumeration counters, per-query profiles
+import instrumentation
+from instrumentation import timed
+
+# Engines that can compute complete, preferred and stable extensions
+ENGINES = ("labelling", "sat", "scc")
+
+# Semantics and engines for credulous and skeptical acceptance of a single argument
+ACCEPTANCE_SEMANTICS = ("admissible", "complete", "preferred", "stable", "grounded")
+ACCEPTANCE_ENGINES = ("labelling", "sat")
 
 # Write an inherited class implementing abstract argumentation frameworks
 class Absargfw:
 
     # Derived class from networkx directed graphs, nodes cannot be sets
-    def __init__(self, nxdigraph):
+    # A CSRGraph can be given instead, then networkx is never used to store the AF
+    # cache_size is the number of results kept, None for no limit and 0 for no caching
+    # profiler is an instrumentation.Profiler recording where the time goes, None for none
+    # preprocessing shrinks the AF by kernel.preprocess before enumerating extensions
+    # store is a result_store.ResultStore keeping results on disk, None for none
+    def __init__(self, nxdigraph, cache_size = 128, profiler = None, preprocessing = True, store = None):
         self.data = nxdigraph
+        self.cache_size = cache_size
+        self.profiler = profiler
+        self.preprocessing = preprocessing
+        self.store = store
+        self._cache = OrderedDict()
+        # bumped by every change made through this class, results are cached per version
+        self.version = 0
+        self._load()
+
+    # (Re)build the native graph from self.data, and forget everything derived from it
+    def _load(self):
+        if isinstance(self.data, CSRGraph):
+            self._graph = self.data
+        else:
+            self._graph = CSRGraph.from_networkx(self.data)
+        self.version += 1
+        # bitset representation and adjacency lists, built on first use
+        self._index = None
+        self._adjacency_lists = None
+        # grounded labelling and components solved by the SCC engine, kept up to date
+        # by add_attack, remove_attack, add_argument and remove_argument
+        self._grounded = None
+        self._components = {}
+        self._graph_fingerprint = None
+        self._parity = None
+        self._cache.clear()
+
+    # The native graph, rebuilt first if self.data has a different number of arguments
+    def _refresh(self):
+        """
+        Change the AF through add_attack, remove_attack, add_argument and remove_argument,
+        which bump self.version and keep everything derived up to date. Changing self.data
+        directly is not supported: only the O(1) test of its number of arguments is made
+        here, so after any direct change call invalidate()
+        """
+        if len(self.data) != len(self._graph):
+            self._load()
+        return self._graph
+
+    # The native graph all queries go through
+    @property
+    def graph(self):
+        return self._refresh()
+
+    # Forget all derived data and cached results, e.g. after changing self.data in place
+    def invalidate(self):
+        self._load()
+
+    """
+    Result cache: least recently used results are evicted beyond cache_size entries
+    """
+
+    # Returns (True, result) if key is cached for the current version, (False, None) otherwise
+    def _cache_lookup(self, key):
+        self._refresh()
+        key = (self.version, key)
+        if key not in self._cache:
+            return False, None
+        # move to the most recently used end
+        value = self._cache.pop(key)
+        self._cache[key] = value
+        return True, value
+
+    # Cache a result, evicting the least recently used ones if the cache is full
+    def _cache_store(self, key, value):
+        if self.cache_size == 0:
+            return
+        self._cache[(self.version, key)] = value
+        while self.cache_size is not None and len(self._cache) > self.cache_size:
+            self._cache.popitem(last = False)
+
+    # Empty the result cache
+    def clear_cache(self):
+        self._cache.clear()
+
+    # Fingerprint of the AF, the key of its results in the on-disk store
+    def _fingerprint(self):
+        graph = self._refresh()
+        if self._graph_fingerprint is None:
+            self._graph_fingerprint = result_store.fingerprint(graph)
+        return self._graph_fingerprint
+
+    """
+    Profiling (see instrumentation.py)
+    """
+
+    # Attach a new profiler, or the one given, and return it
+    def enable_profiling(self, profiler = None):
+        self.profiler = instrumentation.Profiler() if profiler is None else profiler
+        return self.profiler
+
+    # Detach the profiler, and return it with everything it recorded
+    def disable_profiling(self):
+        answer = self.profiler
+        self.profiler = None
+        return answer
+
+    # The profiler's counters for the enumeration engines, or None when not profiling
+    def _stats(self):
+        if self.profiler is None:
+            return None
+        return self.profiler.counters
+
+    """
+    Changing the AF: the result cache is emptied, but the grounded labelling and the
+    components solved by engine = "scc" are only recomputed downstream of the change,
+    since nothing upstream of an argument depends on it
+    """
+
+    # Add the attack (arg1, arg2) between existing arguments
+    def add_attack(self, arg1, arg2):
+        graph = self._refresh()
+        if arg1 not in graph or arg2 not in graph:
+            return "invalid arguments"
+        if graph.has_edge(arg1, arg2):
+            return
+        if not isinstance(self.data, CSRGraph):
+            self.data.add_edge(arg1, arg2)
+        graph.add_edge(arg1, arg2)
+        i = graph.index[arg1]
+        j = graph.index[arg2]
+        if self._adjacency_lists is not None:
+            self._adjacency_lists[0][i].append(j)
+            self._adjacency_lists[1][j].append(i)
+        if self._index is not None:
+            self._victims[i] |= 1 << j
+            self._attackers[j] |= 1 << i
+        self._update(graph.descendants_of(j))
+
+    # Remove the attack (arg1, arg2)
+    def remove_attack(self, arg1, arg2):
+        graph = self._refresh()
+        if not graph.has_edge(arg1, arg2):
+            return "invalid attack"
+        i = graph.index[arg1]
+        j = graph.index[arg2]
+        # what was downstream before the attack went
+        region = graph.descendants_of(j)
+        if not isinstance(self.data, CSRGraph):
+            self.data.remove_edge(arg1, arg2)
+        graph.remove_edge(arg1, arg2)
+        if self._adjacency_lists is not None:
+            self._adjacency_lists[0][i].remove(j)
+            self._adjacency_lists[1][j].remove(i)
+        if self._index is not None:
+            self._victims[i] &= ~(1 << j)
+            self._attackers[j] &= ~(1 << i)
+        self._update(region)
+
+    # Add an unattacked argument, which gets the next index
+    def add_argument(self, argument):
+        graph = self._refresh()
+        if argument in graph:
+            return
+        if not isinstance(self.data, CSRGraph):
+            self.data.add_node(argument)
+        graph.add_node(argument)
+        if self._adjacency_lists is not None:
+            self._adjacency_lists[0].append([])
+            self._adjacency_lists[1].append([])
+        if self._index is not None:
+            self._attackers.append(0)
+            self._victims.append(0)
+            self._all_mask = (1 << len(graph)) - 1
+        if self._grounded is not None:
+            self._grounded.append(fixpoint.UNDEC)
+        self._update([graph.index[argument]])
+
+    # Remove an argument and its attacks, the arguments after it move down one index
+    def remove_argument(self, argument):
+        graph = self._refresh()
+        if argument not in graph:
+            return "invalid argument"
+        i = graph.index[argument]
+        downstream = [graph.names[k] for k in graph.descendants_of(i) if k != i]
+        self._forget_components([argument])
+        if not isinstance(self.data, CSRGraph):
+            self.data.remove_node(argument)
+        graph.remove_node(argument)
+        self._index = None
+        self._adjacency_lists = None
+        if self._grounded is not None:
+            del self._grounded[i]
+        self._update([graph.index[name] for name in downstream])
+
+    # Bring the derived data up to date after a change affecting the arguments in region
+    def _update(self, region):
+        """
+        region holds the indices of the arguments downstream of the change,
+        the grounded labels and solved components of everything else are kept
+        """
+        graph = self._graph
+        self.version += 1
+        self._graph_fingerprint = None
+        self._parity = None
+        self._cache.clear()
+        if self._grounded is not None:
+            fixpoint.update_grounded_labels(graph, self._grounded, region)
+        self._forget_components([graph.names[i] for i in region])
+
+    # Drop the solved SCC components containing any of the arguments
+    def _forget_components(self, arguments):
+        arguments = set(arguments)
+        for store in self._components.values():
+            for key in list(store):
+                if not key.isdisjoint(arguments):
+                    del store[key]
+
+    # Build an AF straight from an iterable of attacks, without networkx
+    @classmethod
+    def from_attacks(cls, attacks, arguments = (), **kwargs):
+        return cls(CSRGraph(attacks, arguments), **kwargs)
+
+    # Export the AF as a networkx directed graph
+    def to_networkx(self):
+        if isinstance(self.data, CSRGraph):
+            return self.graph.to_networkx()
+        return self.data
+
+    # Read an AF from a file name or file object in one of iccma_io.FORMATS
+    @classmethod
+    def from_file(cls, source, fmt = None, **kwargs):
+        """
+        The format is guessed from the file extension if fmt is None
+        """
+        graph = iccma_io.read_af(source, fmt)
+        if not isinstance(graph, CSRGraph):
+            return graph
+        return cls(graph, **kwargs)
+
+    # Write the AF to a file name or file object in one of iccma_io.FORMATS
+    def write(self, target, fmt = None):
+        return iccma_io.write_af(self.graph, target, fmt)
+
+    """
+    Bitset representation: every argument gets an integer index, and every subset of
+    arguments is an integer whose bit i is set iff the argument with index i is in it
+    The frozenset methods below translate to and from this representation
+    """
+
+    # Build the argument <-> index maps and the attacker / victim masks
+    def _build_bitsets(self):
+        """
+        _args[i] is the argument with index i, _index is the inverse map
+        _attackers[i] is the mask of a^- and _victims[i] is the mask of a^+ for a = _args[i]
+        The arguments are indexed in the order of arguments(), so that counting from 0 to
+        2^n - 1 visits the subsets in the same order as powerlist(self.arguments())
+        """
+        graph = self._graph
+        self._args = graph.names
+        self._index = graph.index
+        self._victims, self._attackers = graph.attack_masks()
+        self._all_mask = (1 << len(self._args)) - 1
+
+    # Build the bitsets if they have not been built yet
+    def _ensure_bitsets(self):
+        self._refresh()
+        if self._index is None:
+            self._build_bitsets()
+
+    # Subset of arguments --> mask, or None if the subset is not a subset of arguments
+    def _to_mask(self, subset):
+        self._ensure_bitsets()
+        index = self._index
+        mask = 0
+        for argument in subset:
+            if argument not in index:
+                return None
+            mask |= 1 << index[argument]
+        return mask
+
+    # Is subset a subset of the arguments?
+    def _valid_subset(self, subset):
+        index = self.graph.index
+        for argument in subset:
+            if argument not in index:
+                return False
+        return True
+
+    # Mask --> frozenset of arguments
+    def _from_mask(self, mask):
+        args = self._graph.names
+        return frozenset([args[i] for i in bit_indices(mask)])
+
+    # Successor and predecessor index lists, used by the search engines
+    def _adjacency(self):
+        graph = self._refresh()
+        if self._adjacency_lists is None:
+            self._adjacency_lists = graph.adjacency_lists()
+        return self._adjacency_lists
+
+    # Labellings by the SCC engine, reusing the components solved so far
+    def _scc_labellings(self, semantics):
+        succ, pred = self._adjacency()
+        store = self._components.setdefault(semantics, {})
+        return scc.scc_labellings(succ, pred, semantics, self._graph.names, store)
+
+    # Grounded labelling as a list of labels indexed like the graph
+    def _grounded_labels(self):
+        graph = self._refresh()
+        if self._grounded is None:
+            self._grounded = fixpoint.grounded_labels(graph)
+        return self._grounded
+
+    # Labellings (lists of label bits) --> their IN sets, lazily
+    # the labellings can be of a residual AF from _residual, given with its fixed arguments
+    def _iter_in_sets(self, labellings, residual = None, fixed = ()):
+        IN = labelling.IN_BIT
+        args = self._graph.names if residual is None else residual.names
+        stats = self._stats()
+        for labels in labellings:
+            instrumentation.bump(stats, instrumentation.EXTENSIONS_FOUND)
+            yield self._lift([args[i] for i, label in enumerate(labels) if label == IN], fixed)
+
+    # Sets of indices --> frozensets of arguments, lazily, for this AF or a residual one
+    def _iter_index_sets(self, index_sets, residual = None, fixed = ()):
+        args = self._graph.names if residual is None else residual.names
+        stats = self._stats()
+        for indices in index_sets:
+            instrumentation.bump(stats, instrumentation.EXTENSIONS_FOUND)
+            yield self._lift([args[i] for i in indices], fixed)
+
+    # Arguments of an extension of a residual AF and its fixed arguments --> the extension
+    def _lift(self, arguments, fixed):
+        if not fixed:
+            return frozenset(arguments)
+        # built in index order, like the extensions found without preprocessing
+        index = self._graph.index
+        return frozenset(sorted(arguments + list(fixed), key = index.get))
+
+    # The AF to search for a semantics, its adjacency lists and the arguments it leaves out
+    def _residual(self, semantics):
+        """
+        With preprocessing the residual AF of kernel.preprocess, whose extensions joined
+        with the fixed arguments are the extensions of this AF; otherwise this AF
+        """
+        if not self.preprocessing:
+            return self.graph, self._adjacency(), ()
+        residual, fixed = kernel.preprocess(self.graph, semantics)
+        return residual, residual.adjacency_lists(), fixed
+
+    # Sets of arguments --> list of them in powerlist order
+    def _powerlist_order(self, subsets):
+        index = self._graph.index
+        # comparing the indices from the top down orders the sets like their masks
+        keyed = [(sorted([index[argument] for argument in subset], reverse = True), subset) for subset in subsets]
+        keyed.sort(key = lambda pair: pair[0])
+        return [subset for key, subset in keyed]
+
+    # Masks 0, 1, ..., 2^n - 1 passing a batch condition, in increasing order
+    def _iter_masks(self, condition, processes = 1, found = True):
+        """
+        With numpy the subsets are tested in blocks by batch.BatchEvaluator,
+        otherwise one at a time by batch.MaskEvaluator; with processes other than 1
+        ranges of masks are tested in parallel
+        found: count the masks as extensions found (False when the caller filters them further)
+        """
+        self._ensure_bitsets()
+        if processes != 1:
+            return parallel.iter_masks(self._graph, condition, processes)
+        stats = self._stats()
+        masks = batch.make_evaluator(self._graph).iter_masks(condition, stats = stats)
+        if stats is None or not found:
+            return masks
+        return self._count_found(masks, stats)
+
+    # Pass items through, counting them as found in stats
+    def _count_found(self, items, stats):
+        for item in items:
+            instrumentation.bump(stats, instrumentation.EXTENSIONS_FOUND)
+            yield item
+
+    # IN masks of a semantics from the parallel labelling search --> frozensets, lazily
+    def _iter_parallel(self, semantics, processes):
+        succ, pred = self._adjacency()
+        for mask in parallel.iter_extension_masks(succ, pred, semantics, processes):
+            yield self._from_mask(mask)
+
+    # Mask version of S --> S^+
+    def _plus_mask(self, mask):
+        victims = self._victims
+        answer = 0
+        for i in bit_indices(mask):
+            answer |= victims[i]
+        return answer
+
+    # Mask version of S --> S^-
+    def _minus_mask(self, mask):
+        attackers = self._attackers
+        answer = 0
+        for i in bit_indices(mask):
+            answer |= attackers[i]
+        return answer
+
+    # Mask version of S --> d(S), i.e. all a with a^- a subset of S^+
+    def _defence_mask(self, mask):
+        not_attacked = ~self._plus_mask(mask)
+        answer = 0
+        for i, attackers in enumerate(self._attackers):
+            if not attackers & not_attacked:
+                answer |= 1 << i
+        return answer
+
+    # Mask version of conflict-freeness, i.e. S cap S^+ is empty
+    def _cf_mask(self, mask):
+        return not mask & self._plus_mask(mask)
 
     # List all arguments (nodes)
     def arguments(self):
-        return list(self.data.nodes())
+        return list(self.graph.names)
 
     # List all attacks (edges)
     def attacks(self):
-        return list(self.data.edges())
+        return list(self.graph.edges())
 
     # Number of arguments (finite!)
     def number_of_arguments(self):
-        return self.data.number_of_nodes()
+        return self.graph.number_of_nodes()
 
     # Number of attacks
     def number_of_attacks(self):
-        return self.data.number_of_edges()
+        return self.graph.number_of_edges()
 
     # Forward set, i.e. S --> S^+
+    @timed
     def set_plus(self, subset):
-        if not subset.issubset(self.arguments()):
+        mask = self._to_mask(subset)
+        if mask is None:
             return "invalid subset of arguments"
-        answer = frozenset()
-        for argument in subset:
-            forward_set = set(self.data.successors(argument))
-            answer = answer.union(forward_set)
-        return answer
+        return self._from_mask(self._plus_mask(mask))
 
     # Set attacks, i.e. does S --> a ?
     def set_attacks(self, subset, argument):
-        if not subset.issubset(self.arguments()):
+        if not self._valid_subset(subset):
             return "invalid subset of arguments"
-        elif not argument in self.arguments():
+        elif not argument in self.graph:
             return "invalid argument"
         return argument in self.set_plus(subset)
 
     # Backward set, i.e. S --> S^-
+    @timed
     def set_minus(self, subset):
-        if not subset.issubset(self.arguments()):
+        mask = self._to_mask(subset)
+        if mask is None:
             return "invalid subset of arguments"
-        answer = frozenset()
-        for argument in subset:
-            backward_set = set(self.data.predecessors(argument))
-            answer = answer.union(backward_set)
-        return answer
+        return self._from_mask(self._minus_mask(mask))
 
     # Sets attacking each other
     def subset_attacks(self, set1, set2):
-        if not set1.issubset(self.arguments()) or not set2.issubset(self.arguments()):
+        if not self._valid_subset(set1) or not self._valid_subset(set2):
             return "invalid subset of arguments"
         set1_plus = self.set_plus(set1)
         answer = set1_plus.intersection(set2)
@@ -147,11 +656,12 @@ class Absargfw:
 
     # Unattacked arguments, i.e. is a unattacked?
     def unattacked(self, argument):
-        if not argument in self.arguments():
+        if not argument in self.graph:
             return "invalid argument"
         return len(self.set_minus(set([argument]))) == 0
     
     # Set of unattacked arguments
+    @cached
     def set_of_unattacked(self):
         answer = set()
         for argument in self.arguments():
@@ -161,11 +671,12 @@ class Absargfw:
 
     # Self attacking arguments, i.e. does a --> a?
     def self_attacking(self, argument):
-        if not argument in self.arguments():
+        if not argument in self.graph:
             return "invalid argument"
         return argument in self.set_plus(set([argument]))
     
     # Return all self-attacking arguments
+    @cached
     def set_of_self_attacking(self):
         answer = set()
         for argument in self.arguments():
@@ -185,341 +696,661 @@ class Absargfw:
     def subframework(self, subset):
         """
         https://networkx.github.io/documentation/networkx-1.10/reference/generated/networkx.Graph.subgraph.html
+        The subgraph is copied (networkx 2 returns a frozen view), so that add_attack and
+        the other changes work on the subframework too
         """
-        if not subset.issubset(self.arguments()):
+        if not self._valid_subset(subset):
             return "invalid subset of arguments"
-        answer = Absargfw(self.data.subgraph(subset))
+        if isinstance(self.data, CSRGraph):
+            return Absargfw(self.data.subgraph(subset))
+        answer = Absargfw(self.data.subgraph(subset).copy())
         return answer
 
     # Lists all simple cycles
+    @cached
     def cycles(self):
         """
         https://networkx.github.io/documentation/networkx-1.10/reference/generated/networkx.algorithms.cycles.simple_cycles.html#networkx.algorithms.cycles.simple_cycles
         """
-        return list(nx.simple_cycles(self.data))
+        return list(nx.simple_cycles(self.to_networkx()))
 
-    # Cyclic?
+    # Lazily lists the simple cycles, optionally only those of at most max_length arguments
+    def iter_cycles(self, max_length = None):
+        """
+        Output: generator of cycles as lists of arguments, each attacking the next and the
+        last attacking the first; each cycle appears once
+        """
+        succ, pred = self._adjacency()
+        args = self._graph.names
+        for cycle in cycle_analysis.simple_cycles(succ, max_length):
+            yield [args[i] for i in cycle]
+
+    # Cyclic? Some SCC with two or more arguments, or a self-attack
+    @cached
     def cyclic(self):
-        return len(self.cycles()) > 0
+        succ, pred = self._adjacency()
+        return cycle_analysis.is_cyclic(succ)
+
+    # Is there a cycle of odd length? Some SCC that is not bipartite
+    @cached
+    def odd_cyclic(self):
+        succ, pred = self._adjacency()
+        return cycle_analysis.has_odd_cycle(succ, pred)
 
     # List attack paths from arg1 to arg2, paths are a list of nodes
     def attack_paths(self, arg1, arg2):
-        if arg1 not in self.arguments() or arg2 not in self.arguments():
+        if arg1 not in self.graph or arg2 not in self.graph:
             return "invalid arguments"
-        paths = nx.all_simple_paths(self.data, source = arg1, target = arg2)
+        paths = nx.all_simple_paths(self.to_networkx(), source = arg1, target = arg2)
         answer = list(paths)
         return answer
 
-    # Indirectly attacks, i.e. exists odd-length attack path
-    # As paths are a list of nodes, path lengths are the length - 1 (counting edges)
+    """
+    Indirect attack and defence, by parity reachability (see parity.py): an attack sequence
+    arg1, ..., arg2 (each attacking the next, arguments may repeat) of odd length is an
+    indirect attack, of even length an indirect defence. A parity.ParityIndex, built once
+    per AF, answers these queries; a breadth-first search from arg1 gives a shortest
+    sequence as a witness
+    """
+
+    # Parity reachability index of the AF, built on first use
+    def _parity_index(self):
+        self._refresh()
+        if self._parity is None:
+            succ, pred = self._adjacency()
+            self._parity = parity.ParityIndex(succ)
+        return self._parity
+
+    # Arguments reached from arg1 by odd and by even attack sequences, as two frozensets
+    def parity_reach(self, arg1):
+        if arg1 not in self.graph:
+            return "invalid argument"
+        odd, even = self._parity_index().parity_reach(self._graph.index[arg1])
+        args = self._graph.names
+        return (frozenset([args[i] for i in xrange(len(args)) if odd[i]]),
+                frozenset([args[i] for i in xrange(len(args)) if even[i]]))
+
+    # Shortest attack sequence from arg1 to arg2 with an odd (or even) number of attacks
+    def _parity_walk(self, arg1, arg2, odd):
+        if arg1 not in self.graph or arg2 not in self.graph:
+            return "invalid arguments"
+        succ, pred = self._adjacency()
+        index = self._graph.index
+        wanted = parity.ODD if odd else parity.EVEN
+        if not self._parity_index().reaches(index[arg1], index[arg2], wanted):
+            return None
+        walk = parity.parity_walk(succ, index[arg1], index[arg2], wanted)
+        if walk is None:
+            return None
+        return [self._graph.names[i] for i in walk]
+
+    # Witness of an indirect attack: list of arguments arg1, ..., arg2, or None
+    def indirect_attack_path(self, arg1, arg2):
+        return self._parity_walk(arg1, arg2, True)
+
+    # Witness of an indirect defence: list of arguments arg1, ..., arg2, or None
+    def indirect_defence_path(self, arg1, arg2):
+        return self._parity_walk(arg1, arg2, False)
+
+    # Indirectly attacks, i.e. exists odd-length attack sequence
+    # These predicates stay boolean: False when an argument is not in the AF
     def indirectly_attacks(self, arg1, arg2):
-        paths = self.attack_paths(arg1, arg2)
-        for path in paths:
-            if (len(path) - 1) % 2 == 1:
-                return True
-        return False
+        if arg1 not in self.graph or arg2 not in self.graph:
+            return False
+        index = self._graph.index
+        return self._parity_index().reaches(index[arg1], index[arg2], parity.ODD)
 
-    # Indirectly defends, i.e. exists even-length attack path
+    # Indirectly defends, i.e. exists even-length attack sequence (arg1 defends itself)
     def indirectly_defends(self, arg1, arg2):
-        if arg1 == arg2:
-            return True
-        paths = self.attack_paths(arg1, arg2)
-        for path in paths:
-            if (len(path) - 1) % 2 == 0:
-                return True
-        return False
+        if arg1 not in self.graph or arg2 not in self.graph:
+            return False
+        index = self._graph.index
+        return self._parity_index().reaches(index[arg1], index[arg2], parity.EVEN)
 
     # Is arg1 controversial w.r.t. arg2?
     def controversial_arguments(self, arg1, arg2):
-        if self.indirectly_attacks(arg1, arg2) and self.indirectly_defends(arg1, arg2):
-            return True
-        return False
+        if arg1 not in self.graph or arg2 not in self.graph:
+            return False
+        odd, even = self.parity_reach(arg1)
+        return arg2 in odd and arg2 in even
 
     # Is arg1 a controversial argument?
     def controversial_argument(self, arg1):
-        for arg2 in self.arguments():
-            if self.controversial_arguments(arg1, arg2):
-                return True
-        return False
+        if arg1 not in self.graph:
+            return False
+        return self._parity_index().controversial_from(self._graph.index[arg1])
 
-    # Is the AF controversial?
+    # Is the AF controversial? One lookup per argument in the parity index
+    @cached
     def controversial(self):
-        for arg in self.arguments():
-            if self.controversial_argument(arg):
+        index = self._parity_index()
+        for i in xrange(index.n):
+            if index.controversial_from(i):
                 return True
         return False
 
     # Is the AF limited controversial?
+    @cached
     def limited_controversial(self):
         # use the result: finite AFs with no odd cycles are limited controversial
-        all_cycles = self.cycles()
-        # search through all cycles
-        for cycle in all_cycles:
-            # If there is an odd cycle
-            if len(cycle) % 2 == 1:
-                # Then the AF is not limited controversial
-                return False
-        # If you cannot find an odd cycle then it is limited controversial
-        return True
+        return not self.odd_cyclic()
 
     # Neutrality function, S --> n(S)
+    @timed
     def neutrality(self, subset):
-        if not subset.issubset(self.arguments()):
+        mask = self._to_mask(subset)
+        if mask is None:
             return "invalid subset of arguments"
-        # Calculate S^+
-        attackers = self.set_plus(subset)
         # Calculate A - S^+ = n(S)
-        answerlist = [arg for arg in self.arguments() if arg not in attackers]
-        answer = frozenset(answerlist)
-        return answer
+        return self._from_mask(self._all_mask & ~self._plus_mask(mask))
 
     # Test whether S is conflict free
+    @timed
     def conflict_free(self, subset):
-        if not subset.issubset(self.arguments()):
+        mask = self._to_mask(subset)
+        if mask is None:
             return "invalid subset of arguments"
-        return subset.issubset(self.neutrality(subset))
+        return self._cf_mask(mask)
     
+    # Lazily list all conflict free sets, uses powerset
+    def iter_cf(self, processes = 1):
+        for mask in self._iter_masks(batch.CONFLICT_FREE, processes):
+            yield self._from_mask(mask)
+
     # List all conflict free sets, uses powerset
-    def all_cf(self):
-        all_subsets = powerlist(self.arguments())
-        answer = []
-        for subset in all_subsets:
-            if self.conflict_free(subset):
-                answer.append(subset)
-        return answer
+    @cached
+    def all_cf(self, processes = 1):
+        return list(self.iter_cf(processes))
+
+    # Lazily list all naive extensions
+    def iter_naive(self):
+        stats = self._stats()
+        for mask in self._iter_masks(batch.CONFLICT_FREE, found = False):
+            # conflict-freeness is closed under subsets, so it is enough to try adding one argument
+            maximal = True
+            for i in bit_indices(self._all_mask & ~mask):
+                if self._cf_mask(mask | 1 << i):
+                    maximal = False
+                    break
+            if maximal:
+                instrumentation.bump(stats, instrumentation.EXTENSIONS_FOUND)
+                yield self._from_mask(mask)
 
     # List all naive extensions
+    @cached
     def all_naive(self):
-        return find_max_sets(self.all_cf())
+        return list(self.iter_naive())
 
     # Test whether S is a naive extension
     def naive(self, subset):
-        if not subset.issubset(self.arguments()):
+        if not self._valid_subset(subset):
             return "invalid subset of arguments"
         return subset in self.all_naive()
 
     # Defence function, S --> d(S)
+    @timed
     def defence(self, subset):
-        if not subset.issubset(self.arguments()):
+        mask = self._to_mask(subset)
+        if mask is None:
             return "invalid subset of arguments"
-        attackers = self.set_plus(subset)
-        answer = set()
-        for argument in self.arguments():
-            backwards = self.set_minus(set([argument]))
-            if backwards.issubset(attackers):
-                answer.add(argument)
-        return answer
+        return set(self._from_mask(self._defence_mask(mask)))
 
     # Fixed points of d, uses powerset
+    @cached
     def list_fp_of_d(self):
-        answer = []
-        for subset in powerlist(self.arguments()):
-            if self.defence(subset) == subset:
-                answer.append(subset)
-        return answer
+        return [self._from_mask(mask) for mask in self._iter_masks(batch.FIXED_POINT)]
 
     # Least fixed point of d, know it is unique, uses powerset
     def lfpd(self):
-        return find_min_sets(self.list_fp_of_d())[0]
+        # the least fixed point of d is the grounded extension
+        return self.grounded()
 
     # Test whether S is self defending
     def self_defending(self, subset):
-        if not subset.issubset(self.arguments()):
+        mask = self._to_mask(subset)
+        if mask is None:
             return "invalid subset of arguments"
-        return subset.issubset(self.defence(subset))
+        return not mask & ~self._defence_mask(mask)
     
+    # Lazily list all self defending sets, uses powerset
+    def iter_sd(self):
+        for mask in self._iter_masks(batch.SELF_DEFENDING):
+            yield self._from_mask(mask)
+
     # List all self defending sets, uses powerset
+    @cached
     def all_sd(self):
-        all_subsets = powerlist(self.arguments())
-        answer = []
-        for subset in all_subsets:
-            if self.self_defending(subset):
-                answer.append(subset)
-        return answer
+        return list(self.iter_sd())
+
+    # Lazily list all admissible sets, uses powerset
+    def iter_adm(self, processes = 1):
+        for mask in self._iter_masks(batch.ADMISSIBLE, processes):
+            yield self._from_mask(mask)
     
     # List all admissible sets, uses powerset
-    def all_adm(self):
-        answer = [argset for argset in self.all_cf() if argset in self.all_sd()]
-        return answer
+    @cached
+    def all_adm(self, processes = 1):
+        return list(self.iter_adm(processes))
 
     # Test whether S is admissible
     def admissible(self, subset):
-        if not subset.issubset(self.arguments()):
+        if not self._valid_subset(subset):
             return "invalid subset of arguments"
         return subset in self.all_adm()
 
-    # List all complete extensions, uses powerset
-    def all_comp(self):
-        answer = [argset for argset in self.all_adm() if argset in self.list_fp_of_d()]
-        return answer
+    # Lazily list complete extensions, by labelling search (in parallel if processes is not 1), SAT (engine = "sat") or by SCCs (engine = "scc")
+    def iter_comp(self, engine = "labelling", processes = 1):
+        if engine not in ENGINES:
+            return "invalid engine"
+        if engine == "scc":
+            return self._iter_in_sets(self._scc_labellings(scc.COMPLETE))
+        if engine == "labelling" and processes != 1:
+            return self._iter_parallel(parallel.COMPLETE, processes)
+        residual, (succ, pred), fixed = self._residual(kernel.COMPLETE)
+        if engine == "sat":
+            return self._iter_index_sets(SATReasoner(succ, pred).complete_extensions(), residual, fixed)
+        return self._iter_in_sets(labelling.complete_labellings(succ, pred, stats = self._stats()), residual, fixed)
+
+    # List all complete extensions
+    @cached
+    def all_comp(self, engine = "labelling", processes = 1):
+        if engine not in ENGINES:
+            return "invalid engine"
+        return self._powerlist_order(self.iter_comp(engine, processes))
+
+    # Lazily list preferred extensions, by labelling search (in parallel if processes is not 1), SAT with CEGAR (engine = "sat") or by SCCs (engine = "scc")
+    def iter_pref(self, engine = "labelling", processes = 1):
+        if engine not in ENGINES:
+            return "invalid engine"
+        if engine == "scc":
+            return self._iter_in_sets(self._scc_labellings(scc.PREFERRED))
+        if engine == "labelling" and processes != 1:
+            return self._iter_parallel(parallel.PREFERRED, processes)
+        residual, (succ, pred), fixed = self._residual(kernel.PREFERRED)
+        if engine == "sat":
+            return self._iter_index_sets(SATReasoner(succ, pred).preferred_extensions(), residual, fixed)
+        return self._iter_in_sets(labelling.preferred_labellings(succ, pred, stats = self._stats()), residual, fixed)
 
     # List all preferred extensions
-    def all_pref(self):
-        adm = self.all_adm()
-        return find_max_sets(adm)
+    @cached
+    def all_pref(self, engine = "labelling", processes = 1):
+        if engine not in ENGINES:
+            return "invalid engine"
+        return self._powerlist_order(self.iter_pref(engine, processes))
     
     # Test whether S is preferred
     def preferred(self, subset):
-        if not subset.issubset(self.arguments()):
+        if not self._valid_subset(subset):
             return "invalid subset of arguments"
         return subset in self.all_pref()
 
     # Stable extension, i.e. is S stable?
     def stable(self, subset):
-        if not subset.issubset(self.arguments()):
+        mask = self._to_mask(subset)
+        if mask is None:
             return "invalid subset of arguments"
-        return subset == self.neutrality(subset)
+        return mask == self._all_mask & ~self._plus_mask(mask)
     
+    # Lazily list stable extensions, by labelling search (in parallel if processes is not 1), SAT (engine = "sat") or by SCCs (engine = "scc")
+    def iter_stab(self, engine = "labelling", processes = 1):
+        if engine not in ENGINES:
+            return "invalid engine"
+        if engine == "scc":
+            return self._iter_in_sets(self._scc_labellings(scc.STABLE))
+        if engine == "labelling" and processes != 1:
+            return self._iter_parallel(parallel.STABLE, processes)
+        residual, (succ, pred), fixed = self._residual(kernel.STABLE)
+        if engine == "sat":
+            return self._iter_index_sets(SATReasoner(succ, pred).stable_extensions(), residual, fixed)
+        return self._iter_in_sets(labelling.stable_labellings(succ, pred, stats = self._stats()), residual, fixed)
+
     # List all stable extensions
-    def all_stab(self):
-        all_subsets = powerlist(self.arguments())
-        answer = []
-        for subset in all_subsets:
-            if self.stable(subset):
-                answer.append(subset)
-        return answer
+    @cached
+    def all_stab(self, engine = "labelling", processes = 1):
+        if engine not in ENGINES:
+            return "invalid engine"
+        return self._powerlist_order(self.iter_stab(engine, processes))
     
     # Does a stable extension exist? Note in the finite AF case, all other extension types exist
-    def stable_exists(self):
-        return len(self.all_stab()) > 0
+    @cached
+    def stable_exists(self, engine = "labelling"):
+        if engine not in ENGINES:
+            return "invalid engine"
+        if engine == "sat":
+            # one SAT call on the residual AF, whose stable extensions lift to this AF's
+            residual, (succ, pred), fixed = self._residual(kernel.STABLE)
+            return SATReasoner(succ, pred).stable_exists()
+        # stops at the first stable extension found
+        return next(self.iter_stab(engine), None) is not None
 
     # Return the grounded extension, as least complete extension
+    @cached
     def grounded(self):
-        return find_min_sets(self.all_comp())[0]
+        labels = self._grounded_labels()
+        args = self.graph.names
+        return frozenset([args[i] for i, label in enumerate(labels) if label is fixpoint.IN])
+
+    # Return the grounded labelling, as a dict argument --> "IN", "OUT" or "UNDEC"
+    @cached
+    def grounded_labelling(self):
+        labels = self._grounded_labels()
+        return dict(zip(self.graph.names, labels))
+
+    # Lazily iterate defence function S, d(S), d^2(S), ... until a set repeats
+    def iter_defence(self, subset):
+        if not self._valid_subset(subset):
+            return "invalid subset of arguments"
+        return self._iter_defence(subset)
+
+    # Generator behind iter_defence
+    def _iter_defence(self, subset):
+        index = self.graph.index
+        args = self.graph.names
+        trace = fixpoint.iterate_defence(self.graph, [index[argument] for argument in subset])
+        # S itself comes first, as given
+        next(trace)
+        yield subset
+        for indices in trace:
+            yield set([args[i] for i in indices])
 
     # Iterate defence function S, d(S), d^2(S), ... until stabilisation
     def iterate_defence(self, subset):
-        if not subset.issubset(self.arguments()):
+        if not self._valid_subset(subset):
             return "invalid subset of arguments"
-        answer = [subset]
-        for iteration in range(self.number_of_arguments()):
-            # Must have the last set already iterated
-            current_set = answer[-1]
-            current_set = self.defence(current_set)
-            if current_set not in answer:
-                answer.append(current_set)
-        return answer
+        # at most |A| iterations of d
+        return list(islice(self._iter_defence(subset), self.number_of_arguments() + 1))
 
     # Is the AF coherent? Know that STAB is a subset of PREF already
+    @cached
     def coherent(self):
         PREF = set(self.all_pref())
         STAB = set(self.all_stab())
         return PREF.issubset(STAB)
 
     # Is the AF relatively grounded?
+    @cached
     def relatively_grounded(self):
         PREF = set(self.all_pref())
         skep_PREF = frozenset.intersection(*PREF)
         return skep_PREF == self.grounded()
 
+    """
+    Acceptance of a single argument, without enumerating extensions
+    """
+
+    # The part of the AF that can reach argument through attack paths, and its index there
+    def _slice(self, argument, semantics):
+        """
+        Admissible, complete, preferred and grounded semantics are directional: the
+        extensions restricted to a set of arguments unattacked from outside are the
+        extensions of the subframework. The ancestors of an argument are such a set,
+        so its acceptance only depends on them. Stable semantics is not directional,
+        so for stable the whole AF is kept
+        """
+        if semantics == "stable":
+            return self.graph, self.graph.index[argument]
+        ancestors = self.graph.ancestors_of(self.graph.index[argument])
+        if len(ancestors) == self.number_of_arguments():
+            return self.graph, self.graph.index[argument]
+        names = self.graph.names
+        sliced = self.graph.subgraph([names[i] for i in ancestors])
+        return sliced, sliced.index[argument]
+
+    # Check the arguments of the acceptance queries, returns an error message or None
+    def _acceptance_error(self, argument, semantics, engine):
+        if argument not in self.graph:
+            return "invalid argument"
+        if semantics not in ACCEPTANCE_SEMANTICS:
+            return "invalid semantics"
+        if engine not in ACCEPTANCE_ENGINES:
+            return "invalid engine"
+        return None
+
+    # Is the argument in some extension of the semantics?
+    def credulously_accepted(self, argument, semantics, engine = "labelling"):
+        """
+        Searches the slice of the AF for a single witness: an extension containing argument
+        Credulous acceptance is the same for admissible, complete and preferred
+        """
+        error = self._acceptance_error(argument, semantics, engine)
+        if error:
+            return error
+        graph, a = self._slice(argument, semantics)
+        if semantics == "grounded":
+            return fixpoint.grounded_labels(graph)[a] is fixpoint.IN
+        succ, pred = graph.adjacency_lists()
+        if engine == "sat":
+            return SATReasoner(succ, pred).credulous(a, semantics)
+        dom = [labelling.ANY] * len(succ)
+        dom[a] = labelling.IN_BIT
+        if semantics == "stable":
+            witnesses = labelling.stable_labellings(succ, pred, dom)
+        else:
+            witnesses = labelling.complete_labellings(succ, pred, dom)
+        return next(witnesses, None) is not None
+
+    # Is the argument in every extension of the semantics?
+    def skeptically_accepted(self, argument, semantics, engine = "labelling"):
+        """
+        Searches the slice of the AF for a single counterexample: an extension without argument
+        Skeptical acceptance is the same for complete and grounded, and nothing is
+        skeptically admissible as the empty set is admissible
+        """
+        error = self._acceptance_error(argument, semantics, engine)
+        if error:
+            return error
+        if semantics == "admissible":
+            return False
+        graph, a = self._slice(argument, semantics)
+        if semantics != "stable":
+            # the grounded extension is in every complete (so preferred) extension
+            if fixpoint.grounded_labels(graph)[a] is fixpoint.IN:
+                return True
+            if semantics in ("complete", "grounded"):
+                return False
+        succ, pred = graph.adjacency_lists()
+        if engine == "sat":
+            return SATReasoner(succ, pred).skeptical(a, semantics)
+        dom = [labelling.ANY] * len(succ)
+        dom[a] = labelling.OUT_BIT | labelling.UNDEC_BIT
+        if semantics == "stable":
+            counterexamples = labelling.stable_labellings(succ, pred, dom)
+        else:
+            counterexamples = labelling.preferred_labellings(succ, pred, dom)
+        return next(counterexamples, None) is None
+
     """
     Now begins a selection of the other non-Dung semantics
     """
 
     # Range, i.e. S --> S U S^+ = OK
     def set_range(self, subset):
-        if not subset.issubset(self.arguments()):
+        if not self._valid_subset(subset):
             return "invalid subset of arguments"
         return subset.union(self.set_plus(subset))
 
+    # Semi-stable extensions as an iterator, all found before the first is given
+    def iter_semi_stab(self):
+        """
+        One labelling search over the complete labellings, pruning every branch whose
+        range (IN and OUT arguments) cannot reach a maximal one (see range_search.py)
+        """
+        residual, (succ, pred), fixed = self._residual(kernel.SEMI_STABLE)
+        return self._iter_in_sets(range_search.semi_stable_labellings(succ, pred, self._stats()), residual, fixed)
+
     # List all semi-stable extensions
+    @cached
     def all_semi_stab(self):
-        set_range_list = []
-        for complete_extension in self.all_comp():
-            data = (complete_extension, self.set_range(complete_extension))
-            set_range_list.append(data)
-        range_list = []
-        for item in set_range_list:
-            range_list.append(item[1])
-        max_range = find_max_sets(range_list)
-        answer = []
-        for item in max_range:
-            for pair in set_range_list:
-                if pair[1] == item:
-                    if pair[0] not in answer:
-                        answer.append(pair[0])
-        return answer
+        return self._powerlist_order(self.iter_semi_stab())
 
     # Test whether S is semi-stable
     def semi_stable(self, subset):
-        if not subset.issubset(self.arguments()):
+        if not self._valid_subset(subset):
             return "invalid subset of arguments"
         return subset in self.all_semi_stab()
 
+    # Stage extensions as an iterator, all found before the first is given
+    def iter_stage(self):
+        """
+        One search over the conflict free sets, pruning every branch whose range cannot
+        reach a maximal one (see range_search.py)
+        """
+        residual, (succ, pred), fixed = self._residual(kernel.STAGE)
+        masks = range_search.stage_masks(succ, pred, self._stats())
+        return self._iter_index_sets((bit_indices(mask) for mask in masks), residual, fixed)
+
     # List all stage extensions
+    @cached
     def all_stage(self):
-        set_range_list = []
-        for cf_set in self.all_cf():
-            data = (cf_set, self.set_range(cf_set))
-            set_range_list.append(data)
-        range_list = []
-        for item in set_range_list:
-            range_list.append(item[1])
-        max_range = find_max_sets(range_list)
-        answer = []
-        for item in max_range:
-            for pair in set_range_list:
-                if pair[1] == item:
-                    if pair[0] not in answer:
-                        answer.append(pair[0])
-        return answer
+        return self._powerlist_order(self.iter_stage())
 
     # Test whether S is a stage extension
     def stage(self, subset):
-        if not subset.issubset(self.arguments()):
+        if not self._valid_subset(subset):
             return "invalid subset of arguments"
         return subset in self.all_stage()
 
     # Return the ideal extension (always unique)
-    def ideal(self):
+    @cached
+    def ideal(self, engine = "labelling"):
         """
         The largest admissible set contained in all preferred extensions
+        Dunne (2009): it is the largest admissible subset of the credulously accepted
+        arguments attacked by no credulously accepted argument. That set is conflict free,
+        and dropping the arguments it does not defend until nothing changes leaves its
+        largest admissible subset. Only the credulous acceptance of each argument is
+        searched for (engine = "labelling" or "sat"), never the power set
         """
-        ADM = self.all_adm()
-        PREF = self.all_pref()
-        inter = frozenset.intersection(*PREF)
-        bddADM = [S for S in ADM if S.issubset(inter)]
-        answer = find_max_sets(bddADM)
-        return answer[0]
+        if engine not in ACCEPTANCE_ENGINES:
+            return "invalid engine"
+        credulous = self._credulous_mask(engine)
+        return self._from_mask(self._largest_admissible(credulous & ~self._plus_mask(credulous)))
+
+    # Largest admissible subset of a conflict free set, as masks
+    def _largest_admissible(self, mask):
+        """
+        Drops the arguments the set does not defend until nothing changes; every
+        admissible subset is defended by the set, so it survives each round
+        """
+        while True:
+            kept = mask & self._defence_mask(mask)
+            if kept == mask:
+                return mask
+            mask = kept
+
+    # Mask of the credulously accepted arguments under preferred (equivalently admissible) semantics
+    def _credulous_mask(self, engine = "labelling"):
+        """
+        At most one search per argument, on its slice of the AF: the grounded labelling
+        settles its IN arguments (accepted) and OUT arguments (rejected), and every witness
+        found by the labelling search shows that all its IN arguments are accepted
+        """
+        self._ensure_bitsets()
+        graph = self._graph
+        settled = 0
+        answer = 0
+        for i, label in enumerate(self._grounded_labels()):
+            if label is fixpoint.IN:
+                answer |= 1 << i
+            if label is not fixpoint.UNDEC:
+                settled |= 1 << i
+        for i, argument in enumerate(graph.names):
+            if (settled | answer) >> i & 1:
+                continue
+            if engine == "sat":
+                if self.credulously_accepted(argument, "admissible", "sat"):
+                    answer |= 1 << i
+                continue
+            sliced, a = self._slice(argument, "admissible")
+            succ, pred = sliced.adjacency_lists()
+            dom = [labelling.ANY] * len(succ)
+            dom[a] = labelling.IN_BIT
+            witness = next(labelling.complete_labellings(succ, pred, dom, stats = self._stats()), None)
+            if witness is not None:
+                for k, label in enumerate(witness):
+                    if label == labelling.IN_BIT:
+                        answer |= 1 << graph.index[sliced.names[k]]
+        return answer
 
     # Return the eager extension (unique for finite and finitary)
+    @cached
     def eager(self):
         """
         The largest admissible set contained in all semi-stable extensions
+        The intersection of the semi-stable extensions from the range search is conflict
+        free, and its largest admissible subset is found as for the ideal extension
         """
-        ADM = self.all_adm()
-        SSTAB = self.all_semi_stab()
-        inter = frozenset.intersection(*SSTAB)
-        bddADM = [S for S in ADM if S.issubset(inter)]
-        answer = find_max_sets(bddADM)
-        return answer[0]
+        self._ensure_bitsets()
+        inter = self._all_mask
+        for extension in self.all_semi_stab():
+            inter &= self._to_mask(extension)
+        return self._from_mask(self._largest_admissible(inter))
 
     """
-    Graded acceptability of arguments Modgil Grossi IJCAI 2015 (not tested)
+    Graded acceptability of arguments Modgil Grossi IJCAI 2015 (see graded.py)
     """
 
+    # Mask version of (S,m) --> n_m(S), i.e. all a with |S cap a^-| < m
+    def _graded_neutrality_mask(self, mask, number):
+        answer = 0
+        for i, attackers in enumerate(self._attackers):
+            if antichain.popcount(mask & attackers) < number:
+                answer |= 1 << i
+        return answer
+
     # Graded neutrality function, (S,m) --> n_m(S)
     def graded_neutrality(self, subset, number):
-        if not subset.issubset(self.arguments()):
+        mask = self._to_mask(subset)
+        if mask is None:
             return "invalid subset of arguments"
-        # set up output
-        answer = set()
-        # iterate over all arguments
-        for argument in self.arguments():
-            # Calculate a^-
-            attackers = self.set_minus(set([argument]))
-            # Calculate |S cap a^-|
-            threshold = len(subset.intersection(attackers))
-            if threshold < number:
-                answer.add(argument)
-        return answer
+        return set(self._from_mask(self._graded_neutrality_mask(mask, number)))
 
     # Graded defence function S --> d^m_n(S)
     def graded_defence(self, subset, num1, num2):
-        if not subset.issubset(self.arguments()):
+        mask = self._to_mask(subset)
+        if mask is None:
             return "invalid subset of arguments"
-        intermediate = self.graded_neutrality(subset, num2)
-        answer = self.graded_neutrality(intermediate, num1)
+        intermediate = self._graded_neutrality_mask(mask, num2)
+        return set(self._from_mask(self._graded_neutrality_mask(intermediate, num1)))
+
+    # Graded grounded extension, the least fixed point of d^m_n
+    @cached
+    def graded_grounded(self, num1, num2):
+        if num1 < 1 or num2 < 1:
+            return "invalid grades"
+        inside = graded.graded_grounded(self.graph, num1, num2)
+        args = self._graph.names
+        return frozenset([args[i] for i, member in enumerate(inside) if member])
+
+    # All graded grounded extensions, (m,n) --> G(m,n) for 1 <= m, n <= grades
+    @cached
+    def graded_grounded_grid(self, grades = None):
+        """
+        grades defaults to the largest number of attackers of an argument; beyond it
+        G(m,n) no longer changes with n, and contains every argument once m exceeds it
+        """
+        if grades is not None and grades < 1:
+            return "invalid grades"
+        grid = graded.graded_grounded_grid(self.graph, grades)
+        args = self._graph.names
+        answer = {}
+        for m, row in enumerate(grid):
+            for n, inside in enumerate(row):
+                answer[(m + 1, n + 1)] = frozenset([args[i] for i, member in enumerate(inside) if member])
+        return answer
+
+    # Number of graded grounded extensions G(m,n), 1 <= m, n <= grades, containing each argument
+    def graded_scores(self, grades = None):
+        """
+        A higher score means accepted under more demanding grades, e.g. for ranking
+        """
+        grid = self.graded_grounded_grid(grades)
+        if isinstance(grid, str):
+            return grid
+        answer = dict((argument, 0) for argument in self.arguments())
+        for extension in grid.values():
+            for argument in extension:
+                answer[argument] += 1
         return answer
 
 
@@ -629,6 +1460,7 @@ def test_AF(myAF, example_name):
     if answer:
         start = time.time()
         answer = myAF.all_stab()
+        end = time.time()
         print str(end - start)+"s:", "\t", "Stable extensions are:", "\t", answer
 
     start = time.time()
@@ -676,11 +1508,12 @@ def erdigraph(nodes, prob):
     return answer
 
 # ER argumentation framework (returns object of type Absargfw)
-def eraf(nodes, prob):
+def eraf(nodes, prob, seed = None):
     """
     Outputs an ER-graph as an AF class
+    Generated straight into a CSRGraph by af_generators, in O(nodes + attacks)
     """
-    return Absargfw(erdigraph(nodes, prob))
+    return Absargfw(af_generators.erdos_renyi(nodes, prob, seed))
 
 # How scalable is this code, implemented naively?
 def scalability_measure_powerlist(upper):
@@ -0,0 +1,144 @@
+"""
+Vectorised evaluation of blocks of candidate subsets, for the powerset methods
+
+The attack relation is a 0/1 adjacency matrix A (A[i, j] = 1 iff i attacks j) and a block
+of candidate subsets is a 0/1 matrix S with one row per subset (S[k, i] = 1 iff argument
+index i is in subset k). Row k of S.A counts the attacks from subset k on each argument, so
+    S^+    = S.A > 0
+    d(S)   = the arguments with no attacker outside S^+, i.e. (not S^+).A == 0
+and conflict-freeness, self-defence and fixed points of d are row-wise comparisons.
+One matrix product handles BLOCK_SIZE subsets, instead of one Python loop per subset.
+
+Subsets are numbered by their masks (bit i set iff argument index i is in the subset), as
+in Absargfw, and the masks come out in increasing order.
+
+NumPy is optional: without it HAVE_NUMPY is False and make_evaluator falls back to
+MaskEvaluator, which tests one mask at a time in pure Python.
+"""
+
+from instrumentation import bump, SUBSETS_VISITED
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+# Number of subsets evaluated per matrix product
+BLOCK_SIZE = 4096
+
+# Masks are numpy 64-bit integers, so at most 62 arguments (2^62 subsets is out of reach anyway)
+MAX_ARGUMENTS = 62
+
+# Conditions understood by BatchEvaluator.iter_masks
+CONFLICT_FREE = "conflict_free"
+SELF_DEFENDING = "self_defending"
+ADMISSIBLE = "admissible"
+FIXED_POINT = "fixed_point"
+CONDITIONS = (CONFLICT_FREE, SELF_DEFENDING, ADMISSIBLE, FIXED_POINT)
+
+class BatchEvaluator(object):
+
+    # Evaluator for the AF given by a CSRGraph
+    def __init__(self, graph, block_size = BLOCK_SIZE):
+        n = len(graph)
+        self.n = n
+        self.block_size = block_size
+        # float32, so that the products go to BLAS; the counts are small integers, hence exact
+        self.adjacency = np.zeros((n, n), dtype = np.float32)
+        for i in xrange(n):
+            for j in graph.succ_of(i):
+                self.adjacency[i, j] = 1
+        self.bits = np.arange(n, dtype = np.int64)
+
+    # The subsets with masks start, start + 1, ..., stop - 1 as a 0/1 matrix
+    def block(self, start, stop):
+        masks = np.arange(start, stop, dtype = np.int64)
+        return ((masks[:, None] >> self.bits) & 1).astype(np.float32)
+
+    # Row-wise S --> S^+, as a boolean matrix
+    def plus(self, subsets):
+        return subsets.dot(self.adjacency) > 0
+
+    # Row-wise S^+ --> d(S), as a boolean matrix
+    def defence(self, plus):
+        return (~plus).astype(np.float32).dot(self.adjacency) == 0
+
+    # Boolean vector: which rows pass the condition
+    def evaluate(self, subsets, condition):
+        """
+        Input: 0/1 matrix of subsets, one of CONDITIONS
+        Output: boolean vector with one entry per row
+        """
+        inside = subsets > 0
+        plus = self.plus(subsets)
+        if condition == CONFLICT_FREE:
+            return ~(inside & plus).any(axis = 1)
+        defended = self.defence(plus)
+        if condition == FIXED_POINT:
+            return (inside == defended).all(axis = 1)
+        self_defending = ~(inside & ~defended).any(axis = 1)
+        if condition == SELF_DEFENDING:
+            return self_defending
+        return self_defending & ~(inside & plus).any(axis = 1)
+
+    # Masks from start to stop - 1 (default all 2^n) passing the condition, in increasing order
+    def iter_masks(self, condition, start = 0, stop = None, stats = None):
+        """
+        Lazy, block by block; the subsets tested are added to the counters in stats
+        """
+        stop = 1 << self.n if stop is None else stop
+        for low in xrange(start, stop, self.block_size):
+            high = min(low + self.block_size, stop)
+            bump(stats, SUBSETS_VISITED, high - low)
+            passed = self.evaluate(self.block(low, high), condition)
+            for offset in np.flatnonzero(passed):
+                yield low + int(offset)
+
+class MaskEvaluator(object):
+
+    # The same conditions, one mask at a time in pure Python
+    def __init__(self, graph):
+        self.n = len(graph)
+        self.victims, self.attackers = graph.attack_masks()
+
+    # S --> S^+
+    def plus(self, mask):
+        answer = 0
+        for i in xrange(self.n):
+            if mask >> i & 1:
+                answer |= self.victims[i]
+        return answer
+
+    # S^+ --> d(S)
+    def defence(self, plus):
+        answer = 0
+        for i in xrange(self.n):
+            if not self.attackers[i] & ~plus:
+                answer |= 1 << i
+        return answer
+
+    # Does the subset pass the condition?
+    def evaluate(self, mask, condition):
+        plus = self.plus(mask)
+        if condition == CONFLICT_FREE:
+            return not mask & plus
+        defended = self.defence(plus)
+        if condition == FIXED_POINT:
+            return mask == defended
+        if condition == SELF_DEFENDING:
+            return not mask & ~defended
+        return not mask & ~defended and not mask & plus
+
+    def iter_masks(self, condition, start = 0, stop = None, stats = None):
+        stop = 1 << self.n if stop is None else stop
+        for mask in xrange(start, stop):
+            bump(stats, SUBSETS_VISITED)
+            if self.evaluate(mask, condition):
+                yield mask
+
+# Evaluator for the AF given by a CSRGraph, vectorised if possible
+def make_evaluator(graph):
+    if HAVE_NUMPY and len(graph) <= MAX_ARGUMENTS:
+        return BatchEvaluator(graph)
+    return MaskEvaluator(graph)
@@ -0,0 +1,364 @@
+"""
+Benchmark suite for the semantics methods of Absargfw
+
+Every method in METHODS is timed on every graph family in FAMILIES, for every size and
+density asked for. Each case runs a few warm-up rounds, then a number of timed repetitions
+on a fresh Absargfw without a result cache, so no repetition is answered from the cache.
+Reported per case: min, median, mean, 90th and 99th percentile times in seconds, and
+peak memory in kB (None where it cannot be measured). Times come from a monotonic clock,
+whose name is recorded in the meta data of the results.
+
+Usage:
+    python benchmark.py run -o results.json --sizes 4,8,12 --densities 0.1,0.3
+    python benchmark.py compare old.json new.json --threshold 1.2
+
+compare flags the cases whose median got slower by more than the threshold factor.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+
+import ctypes
+import ctypes.util
+
+# peak memory of a single run with tracemalloc (Python 3), else the growth of the high-water
+# mark of a forked process running only that case
+try:
+    import tracemalloc
+    HAVE_TRACEMALLOC = True
+except ImportError:
+    HAVE_TRACEMALLOC = False
+try:
+    import resource
+    HAVE_RESOURCE = True
+except ImportError:
+    HAVE_RESOURCE = False
+import os
+import multiprocessing
+
+import networkx as nx
+from basic_abs_arg import Absargfw
+
+# CLOCK_MONOTONIC of clock_gettime, by sys.platform prefix
+_MONOTONIC_IDS = (("linux", 1), ("darwin", 6), ("freebsd", 4), ("openbsd", 3), ("netbsd", 3))
+
+class _timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+# A monotonic clock and its name: time.perf_counter on Python 3; on Python 2
+# clock_gettime(CLOCK_MONOTONIC) through ctypes, and time.time only if that is missing
+def _monotonic_clock():
+    if hasattr(time, "perf_counter"):
+        return time.perf_counter, "time.perf_counter"
+    clock_id = None
+    for prefix, number in _MONOTONIC_IDS:
+        if sys.platform.startswith(prefix):
+            clock_id = number
+    # clock_gettime is in libc, or in librt for glibc before 2.17
+    for name in ("c", "rt"):
+        path = ctypes.util.find_library(name)
+        if clock_id is None or path is None:
+            continue
+        try:
+            clock_gettime = ctypes.CDLL(path, use_errno = True).clock_gettime
+        except (OSError, AttributeError):
+            continue
+        clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(_timespec)]
+        clock_gettime.restype = ctypes.c_int
+        spec = _timespec()
+        if clock_gettime(clock_id, ctypes.byref(spec)) != 0:
+            continue
+        def monotonic():
+            clock_gettime(clock_id, ctypes.byref(spec))
+            return spec.tv_sec + spec.tv_nsec * 1e-9
+        return monotonic, "clock_gettime(CLOCK_MONOTONIC)"
+    return time.time, "time.time"
+
+clock, CLOCK_NAME = _monotonic_clock()
+
+"""
+Graph families: (size, density, seed) --> networkx DiGraph
+"""
+
+# Erdos-Renyi, every attack present with probability density
+def er_family(size, density, seed):
+    return nx.gnp_random_graph(size, density, seed = seed, directed = True)
+
+# Cycle of attacks, density is the probability of each extra random attack
+def cycle_family(size, density, seed):
+    answer = nx.cycle_graph(size, create_using = nx.DiGraph())
+    _add_random_attacks(answer, density, seed)
+    return answer
+
+# Chain of attacks, with random extra attacks as for cycles
+def chain_family(size, density, seed):
+    answer = nx.path_graph(size, create_using = nx.DiGraph())
+    _add_random_attacks(answer, density, seed)
+    return answer
+
+# Square grid of mutual attacks between neighbours, nodes relabelled 0, ..., size - 1
+def grid_family(size, density, seed):
+    width = max(1, int(size ** 0.5))
+    answer = nx.DiGraph()
+    answer.add_nodes_from(range(size))
+    for node in range(size):
+        for other in (node + 1, node + width):
+            if other < size and (other != node + 1 or other % width):
+                answer.add_edge(node, other)
+                answer.add_edge(other, node)
+    _add_random_attacks(answer, density, seed)
+    return answer
+
+# Scale-free directed graph (Bollobas et al.), density is ignored
+def scale_free_family(size, density, seed):
+    answer = nx.DiGraph(nx.scale_free_graph(size, seed = seed))
+    answer.remove_edges_from([(u, v) for (u, v) in answer.edges() if u == v])
+    return answer
+
+def _add_random_attacks(graph, density, seed):
+    rng = random.Random(seed)
+    nodes = list(graph.nodes())
+    for u in nodes:
+        for v in nodes:
+            if u != v and rng.random() < density / 10.0:
+                graph.add_edge(u, v)
+
+FAMILIES = {
+    "er": er_family,
+    "cycle": cycle_family,
+    "chain": chain_family,
+    "grid": grid_family,
+    "scale_free": scale_free_family,
+}
+
+"""
+Methods: (label, method name, keyword arguments)
+"""
+
+METHODS = [
+    ("grounded", "grounded", {}),
+    ("all_cf", "all_cf", {}),
+    ("all_naive", "all_naive", {}),
+    ("all_adm", "all_adm", {}),
+    ("all_sd", "all_sd", {}),
+    ("list_fp_of_d", "list_fp_of_d", {}),
+    ("all_comp", "all_comp", {}),
+    ("all_comp[sat]", "all_comp", {"engine": "sat"}),
+    ("all_comp[scc]", "all_comp", {"engine": "scc"}),
+    ("all_pref", "all_pref", {}),
+    ("all_pref[sat]", "all_pref", {"engine": "sat"}),
+    ("all_pref[scc]", "all_pref", {"engine": "scc"}),
+    ("all_stab", "all_stab", {}),
+    ("all_stab[sat]", "all_stab", {"engine": "sat"}),
+    ("all_stab[scc]", "all_stab", {"engine": "scc"}),
+    ("stable_exists", "stable_exists", {}),
+    ("all_semi_stab", "all_semi_stab", {}),
+    ("all_stage", "all_stage", {}),
+    ("ideal", "ideal", {}),
+    ("eager", "eager", {}),
+]
+
+# Methods that go through all 2^n subsets, skipped above powerset_limit arguments
+POWERSET_METHODS = set(["all_cf", "all_naive", "all_adm", "all_sd", "list_fp_of_d"])
+
+"""
+Statistics
+"""
+
+# p-th percentile (0 <= p <= 100) of a list of numbers, with linear interpolation
+def percentile(values, p):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * p / 100.0
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+def summarise(times):
+    return {
+        "min": min(times),
+        "median": percentile(times, 50),
+        "mean": sum(times) / len(times),
+        "p90": percentile(times, 90),
+        "p99": percentile(times, 99),
+    }
+
+# Peak memory in kB while calling function(), None where it cannot be measured
+def measure_memory(function):
+    """
+    Without tracemalloc, function runs in a forked process: a new process starts its
+    high-water mark (ru_maxrss) at its size when forked, so its growth is the peak of this
+    case alone, not of everything run so far
+    """
+    if HAVE_TRACEMALLOC:
+        tracemalloc.start()
+        try:
+            function()
+            return tracemalloc.get_traced_memory()[1] // 1024
+        finally:
+            tracemalloc.stop()
+    if not HAVE_RESOURCE or not hasattr(os, "fork"):
+        return None
+    receiver, sender = multiprocessing.Pipe(duplex = False)
+    child = multiprocessing.Process(target = _memory_growth, args = (function, sender))
+    child.start()
+    growth = receiver.recv() if receiver.poll(None) else None
+    child.join()
+    if growth is None:
+        return None
+    # kB on Linux, bytes on macOS
+    return growth // 1024 if sys.platform == "darwin" else growth
+
+# Run in the forked process: send the growth of the high-water mark while calling function()
+def _memory_growth(function, sender):
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    function()
+    sender.send(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+    sender.close()
+
+"""
+Running and comparing
+"""
+
+# Time one method on one graph
+def time_case(graph, name, kwargs, warmup = 1, repeat = 5):
+    """
+    Input: networkx DiGraph, method name, its keyword arguments, number of warm-up and
+    timed runs
+    Output: dict of the times, their summary and the peak memory
+    """
+    call = lambda: getattr(Absargfw(graph, cache_size = 0), name)(**kwargs)
+    for round in range(warmup):
+        call()
+    times = []
+    for round in range(repeat):
+        af = Absargfw(graph, cache_size = 0)
+        method = getattr(af, name)
+        start = clock()
+        method(**kwargs)
+        times.append(clock() - start)
+    answer = summarise(times)
+    answer["times"] = times
+    answer["peak_memory_kb"] = measure_memory(call)
+    return answer
+
+# Run the whole grid of cases
+def run(families = None, sizes = (4, 8, 12), densities = (0.1, 0.3), methods = None,
+        warmup = 1, repeat = 5, seed = 0, powerset_limit = 14, progress = None):
+    """
+    Input: family names (default all), sizes, densities, method labels (default all),
+    warm-up and timed runs per case, seed of the graphs, largest size for the powerset
+    methods, optional function called with a line of text after every case
+    Output: dict with the settings under "meta" and one entry per case under "results"
+    """
+    families = sorted(FAMILIES) if families is None else families
+    chosen = [entry for entry in METHODS if methods is None or entry[0] in methods]
+    results = []
+    for family in families:
+        for size in sizes:
+            for density in densities:
+                graph = FAMILIES[family](size, density, seed)
+                for label, name, kwargs in chosen:
+                    if name in POWERSET_METHODS and size > powerset_limit:
+                        continue
+                    case = time_case(graph, name, kwargs, warmup, repeat)
+                    case.update({"family": family, "size": size, "density": density,
+                                 "method": label, "attacks": graph.number_of_edges()})
+                    results.append(case)
+                    if progress is not None:
+                        progress("%s n=%d p=%s %s: median %.6fs" % (family, size, density, label, case["median"]))
+    meta = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "clock": CLOCK_NAME,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "warmup": warmup,
+        "repeat": repeat,
+        "seed": seed,
+    }
+    return {"meta": meta, "results": results}
+
+# Key identifying a case across result files
+def case_key(case):
+    return (case["family"], case["size"], case["density"], case["method"])
+
+# Compare the medians of two result dicts
+def compare(old, new, threshold = 1.2):
+    """
+    Input: two outputs of run (e.g. loaded from JSON), factor beyond which a change counts
+    Output: list of dicts, one per case present in both, with the old and new medians,
+    their ratio new / old, and status "regression", "improvement" or "same"
+    """
+    before = dict((case_key(case), case) for case in old["results"])
+    answer = []
+    for case in new["results"]:
+        key = case_key(case)
+        if key not in before:
+            continue
+        old_median = before[key]["median"]
+        new_median = case["median"]
+        ratio = new_median / old_median if old_median > 0 else float("inf")
+        if ratio > threshold:
+            status = "regression"
+        elif ratio < 1.0 / threshold:
+            status = "improvement"
+        else:
+            status = "same"
+        answer.append({"family": key[0], "size": key[1], "density": key[2], "method": key[3],
+                       "old_median": old_median, "new_median": new_median,
+                       "ratio": ratio, "status": status})
+    return answer
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark the semantics methods of Absargfw")
+    commands = parser.add_subparsers(dest = "command")
+    run_parser = commands.add_parser("run", help = "run the benchmarks and write JSON")
+    run_parser.add_argument("-o", "--output", default = "benchmark.json")
+    run_parser.add_argument("--families", default = ",".join(sorted(FAMILIES)))
+    run_parser.add_argument("--sizes", default = "4,8,12")
+    run_parser.add_argument("--densities", default = "0.1,0.3")
+    run_parser.add_argument("--methods", default = None, help = "comma separated labels, default all")
+    run_parser.add_argument("--warmup", type = int, default = 1)
+    run_parser.add_argument("--repeat", type = int, default = 5)
+    run_parser.add_argument("--seed", type = int, default = 0)
+    run_parser.add_argument("--powerset-limit", type = int, default = 14)
+    compare_parser = commands.add_parser("compare", help = "compare two JSON result files")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type = float, default = 1.2)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run(families = args.families.split(","),
+                      sizes = [int(size) for size in args.sizes.split(",")],
+                      densities = [float(density) for density in args.densities.split(",")],
+                      methods = None if args.methods is None else args.methods.split(","),
+                      warmup = args.warmup, repeat = args.repeat, seed = args.seed,
+                      powerset_limit = args.powerset_limit,
+                      progress = lambda line: sys.stdout.write(line + "\n"))
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent = 1)
+        return 0
+
+    with open(args.old) as handle:
+        old = json.load(handle)
+    with open(args.new) as handle:
+        new = json.load(handle)
+    rows = compare(old, new, args.threshold)
+    for row in rows:
+        if row["status"] != "same":
+            print("%-11s %s n=%d p=%s %s: %.6fs -> %.6fs (x%.2f)" % (
+                row["status"], row["family"], row["size"], row["density"], row["method"],
+                row["old_median"], row["new_median"], row["ratio"]))
+    regressions = sum(1 for row in rows if row["status"] == "regression")
+    print("%d cases compared, %d regressions" % (len(rows), regressions))
+    # non-zero exit status when something got slower, for use in scripts
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
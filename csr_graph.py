@@ -0,0 +1,318 @@
+"""
+Native graph backend for abstract argumentation frameworks
+
+A directed graph stored in compressed sparse row (CSR) form: the nodes are numbered
+0, 1, ..., n - 1 and the successors of node i are succ[succ_offsets[i]:succ_offsets[i+1]],
+and dually for the predecessors. The arrays are contiguous machine integers, so an
+attack costs two integers (one forward, one backward) instead of networkx's per-edge dicts.
+
+The graph is built once from any iterable of edges. It can be changed in place
+(add_node, add_edge, remove_edge, remove_node), but every change moves O(n + m) array
+entries, so it suits occasional updates rather than building a graph edge by edge.
+It implements the part of the networkx DiGraph interface used by Absargfw
+(nodes, edges, successors, predecessors, subgraph, ...), and converts to and from networkx.
+"""
+
+from array import array
+
+# typecode of the index arrays, 'i' is a (at least) 32-bit signed integer
+INDEX_TYPE = 'i'
+
+class CSRGraph(object):
+
+    # Build the graph from an iterable of edges (pairs of hashable nodes)
+    def __init__(self, edges = (), nodes = ()):
+        """
+        Input: an iterable of pairs (u, v), optionally an iterable of nodes
+        The nodes are numbered in the order given by nodes, then in the order they first
+        appear in edges - this is the order networkx would list them in
+        Duplicate edges are ignored, as in networkx
+        """
+        names = []
+        index = {}
+        for node in nodes:
+            if node not in index:
+                index[node] = len(names)
+                names.append(node)
+        # one pass over the edges, storing them as pairs of indices
+        sources = array(INDEX_TYPE)
+        targets = array(INDEX_TYPE)
+        for (u, v) in edges:
+            i = index.get(u)
+            if i is None:
+                i = index[u] = len(names)
+                names.append(u)
+            j = index.get(v)
+            if j is None:
+                j = index[v] = len(names)
+                names.append(v)
+            sources.append(i)
+            targets.append(j)
+        self.names = names
+        self.index = index
+        self.succ_offsets, self.succ = _compress(len(names), sources, targets)
+        del sources, targets
+        self.pred_offsets, self.pred = _transpose(len(names), self.succ_offsets, self.succ)
+
+    # Build the graph directly from index arrays (no per-edge Python objects)
+    @classmethod
+    def from_index_arrays(cls, names, sources, targets):
+        """
+        Input: list of node names, two equal length arrays of node indices
+        Output: CSRGraph with an edge names[sources[k]] -> names[targets[k]] for every k
+        """
+        graph = cls()
+        graph.names = list(names)
+        graph.index = dict((name, i) for i, name in enumerate(graph.names))
+        n = len(graph.names)
+        graph.succ_offsets, graph.succ = _compress(n, sources, targets)
+        graph.pred_offsets, graph.pred = _transpose(n, graph.succ_offsets, graph.succ)
+        return graph
+
+    # Adapter: networkx DiGraph --> CSRGraph
+    @classmethod
+    def from_networkx(cls, nxdigraph):
+        return cls(nxdigraph.edges(), nxdigraph.nodes())
+
+    # Adapter: CSRGraph --> networkx DiGraph
+    def to_networkx(self):
+        import networkx as nx
+        answer = nx.DiGraph()
+        answer.add_nodes_from(self.names)
+        answer.add_edges_from(self.edges())
+        return answer
+
+    """
+    Index level access, used by the engines
+    """
+
+    # Successor indices of node index i
+    def succ_of(self, i):
+        return self.succ[self.succ_offsets[i]:self.succ_offsets[i + 1]]
+
+    # Predecessor indices of node index i
+    def pred_of(self, i):
+        return self.pred[self.pred_offsets[i]:self.pred_offsets[i + 1]]
+
+    # Number of successors of node index i
+    def out_degree_of(self, i):
+        return self.succ_offsets[i + 1] - self.succ_offsets[i]
+
+    # Number of predecessors of node index i
+    def in_degree_of(self, i):
+        return self.pred_offsets[i + 1] - self.pred_offsets[i]
+
+    # Indices of the nodes with a path to node index i, including i, in increasing order
+    def ancestors_of(self, i):
+        return _reachable(self.pred_offsets, self.pred, i)
+
+    # Indices of the nodes with a path from node index i, including i, in increasing order
+    def descendants_of(self, i):
+        return _reachable(self.succ_offsets, self.succ, i)
+
+    # Lists of successor and predecessor indices for every node
+    def adjacency_lists(self):
+        """
+        Output: (successors, predecessors), each a list of n lists of indices
+        Convenient for the search engines, which look these up many times
+        """
+        succ = [list(self.succ_of(i)) for i in xrange(len(self.names))]
+        pred = [list(self.pred_of(i)) for i in xrange(len(self.names))]
+        return succ, pred
+
+    # Bitmasks of the victims and of the attackers of every node
+    def attack_masks(self):
+        return attack_masks([self.succ_of(i) for i in xrange(len(self.names))])
+
+    """
+    The part of the networkx DiGraph interface used by Absargfw
+    """
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def nodes(self):
+        return list(self.names)
+
+    def edges(self):
+        names = self.names
+        for i, j in self.index_edges():
+            yield (names[i], names[j])
+
+    # Attacks as pairs of indices
+    def index_edges(self):
+        succ = self.succ
+        offsets = self.succ_offsets
+        for i in xrange(len(self.names)):
+            for k in xrange(offsets[i], offsets[i + 1]):
+                yield i, succ[k]
+
+    def number_of_nodes(self):
+        return len(self.names)
+
+    def number_of_edges(self):
+        return len(self.succ)
+
+    def successors(self, node):
+        names = self.names
+        return iter([names[j] for j in self.succ_of(self.index[node])])
+
+    def predecessors(self, node):
+        names = self.names
+        return iter([names[j] for j in self.pred_of(self.index[node])])
+
+    def has_edge(self, u, v):
+        if u not in self.index or v not in self.index:
+            return False
+        return self.index[v] in self.succ_of(self.index[u])
+
+    # Induced subgraph, keeping the relative order of the nodes
+    def subgraph(self, nodes):
+        index = self.index
+        keep = sorted(set(index[node] for node in nodes if node in index))
+        new_index = dict((i, k) for k, i in enumerate(keep))
+        sources = array(INDEX_TYPE)
+        targets = array(INDEX_TYPE)
+        for i in keep:
+            for j in self.succ_of(i):
+                if j in new_index:
+                    sources.append(new_index[i])
+                    targets.append(new_index[j])
+        return CSRGraph.from_index_arrays([self.names[i] for i in keep], sources, targets)
+
+    """
+    In-place changes
+    """
+
+    def add_node(self, node):
+        if node in self.index:
+            return
+        self.index[node] = len(self.names)
+        self.names.append(node)
+        self.succ_offsets.append(self.succ_offsets[-1])
+        self.pred_offsets.append(self.pred_offsets[-1])
+
+    def add_edge(self, u, v):
+        self.add_node(u)
+        self.add_node(v)
+        if self.has_edge(u, v):
+            return
+        i = self.index[u]
+        j = self.index[v]
+        _insert(self.succ_offsets, self.succ, i, j)
+        _insert(self.pred_offsets, self.pred, j, i)
+
+    def remove_edge(self, u, v):
+        if not self.has_edge(u, v):
+            return
+        i = self.index[u]
+        j = self.index[v]
+        _delete(self.succ_offsets, self.succ, i, j)
+        _delete(self.pred_offsets, self.pred, j, i)
+
+    # Remove a node and its edges, the nodes after it move down one index
+    def remove_node(self, node):
+        if node not in self.index:
+            return
+        rest = self.subgraph([name for name in self.names if name != node])
+        self.names = rest.names
+        self.index = rest.index
+        self.succ_offsets, self.succ = rest.succ_offsets, rest.succ
+        self.pred_offsets, self.pred = rest.pred_offsets, rest.pred
+
+# Successor lists --> (victims, attackers), lists of bitmasks of indices
+def attack_masks(succ):
+    """
+    victims[i] has bit j set iff i attacks j, attackers[j] has bit i set iff i attacks j
+    """
+    n = len(succ)
+    victims = [0] * n
+    attackers = [0] * n
+    for i in xrange(n):
+        for j in succ[i]:
+            victims[i] |= 1 << j
+            attackers[j] |= 1 << i
+    return victims, attackers
+
+# Nodes reachable from node index i along the rows of a CSR array
+def _reachable(offsets, row, i):
+    seen = set([i])
+    stack = [i]
+    while stack:
+        j = stack.pop()
+        for k in xrange(offsets[j], offsets[j + 1]):
+            other = row[k]
+            if other not in seen:
+                seen.add(other)
+                stack.append(other)
+    return sorted(seen)
+
+# Append value to row i of a CSR array
+def _insert(offsets, row, i, value):
+    row.insert(offsets[i + 1], value)
+    for k in xrange(i + 1, len(offsets)):
+        offsets[k] += 1
+
+# Delete value from row i of a CSR array
+def _delete(offsets, row, i, value):
+    for k in xrange(offsets[i], offsets[i + 1]):
+        if row[k] == value:
+            del row[k]
+            break
+    for k in xrange(i + 1, len(offsets)):
+        offsets[k] -= 1
+
+# Counting sort of the edge list into CSR form, dropping duplicate edges
+def _compress(n, sources, targets):
+    """
+    Input: number of nodes n, arrays of source and target indices
+    Output: (offsets, row) with the targets of node i in row[offsets[i]:offsets[i+1]],
+    in the order they were given, each target at most once
+    """
+    counts = array(INDEX_TYPE, [0]) * (n + 1)
+    for i in sources:
+        counts[i + 1] += 1
+    for i in xrange(n):
+        counts[i + 1] += counts[i]
+    position = array(INDEX_TYPE, counts)
+    row = array(INDEX_TYPE, [0]) * len(sources)
+    for k in xrange(len(sources)):
+        i = sources[k]
+        row[position[i]] = targets[k]
+        position[i] += 1
+    # drop duplicate targets within each row, keeping the first occurrence
+    offsets = array(INDEX_TYPE, [0]) * (n + 1)
+    write = 0
+    for i in xrange(n):
+        seen = set()
+        for k in xrange(counts[i], counts[i + 1]):
+            j = row[k]
+            if j not in seen:
+                seen.add(j)
+                row[write] = j
+                write += 1
+        offsets[i + 1] = write
+    del row[write:]
+    return offsets, row
+
+# Reverse all edges of a CSR graph
+def _transpose(n, offsets, row):
+    counts = array(INDEX_TYPE, [0]) * (n + 1)
+    for j in row:
+        counts[j + 1] += 1
+    for j in xrange(n):
+        counts[j + 1] += counts[j]
+    position = array(INDEX_TYPE, counts)
+    transposed = array(INDEX_TYPE, [0]) * len(row)
+    for i in xrange(n):
+        for k in xrange(offsets[i], offsets[i + 1]):
+            j = row[k]
+            transposed[position[j]] = i
+            position[j] += 1
+    return counts, transposed
@@ -0,0 +1,82 @@
+"""
+Cycle analysis of the attack graph through its strongly connected components
+
+Every cycle lies inside one strongly connected component (SCC), so
+    cyclic:     some SCC has two or more arguments, or an argument attacks itself
+    odd cycle:  some SCC is not bipartite, i.e. its attacks, taken as undirected edges,
+                cannot be 2-coloured (a strongly connected digraph has an odd directed
+                cycle iff its underlying undirected graph is not bipartite); a
+                self-attack is an odd cycle of length 1
+Both take one pass over the SCCs, O(|A| + |R|), instead of listing every simple cycle.
+
+The simple cycles themselves are still available lazily, with an optional bound on their
+length: a depth-first search from each argument s through the arguments of its SCC with
+larger index, so every cycle is found once, starting from its smallest index.
+
+succ[v] lists the arguments v attacks and pred[v] those attacking v, by index.
+"""
+
+from scc import strongly_connected_components
+
+# Does the graph have a cycle?
+def is_cyclic(succ):
+    for v in xrange(len(succ)):
+        if v in succ[v]:
+            return True
+    return any(len(component) > 1 for component in strongly_connected_components(succ))
+
+# Does the graph have a cycle of odd length?
+def has_odd_cycle(succ, pred):
+    for component in strongly_connected_components(succ):
+        if not _bipartite(component, succ, pred):
+            return True
+    return False
+
+# Can the component's attacks, as undirected edges, be 2-coloured?
+def _bipartite(component, succ, pred):
+    inside = set(component)
+    colour = {component[0]: 0}
+    stack = [component[0]]
+    while stack:
+        v = stack.pop()
+        for w in succ[v] + pred[v]:
+            if w not in inside:
+                continue
+            if w not in colour:
+                colour[w] = 1 - colour[v]
+                stack.append(w)
+            elif colour[w] == colour[v]:
+                # includes the self-attack w == v
+                return False
+    return True
+
+# Lazily list the simple cycles, as lists of indices
+def simple_cycles(succ, max_length = None):
+    """
+    Input: successor lists, optional largest number of arguments in a cycle
+    Output: generator of cycles [s, v1, ..., vk] where s attacks v1, ..., vk attacks s,
+    and s is the smallest index on the cycle
+    """
+    component_of = {}
+    for number, component in enumerate(strongly_connected_components(succ)):
+        for v in component:
+            component_of[v] = number
+    for s in xrange(len(succ)):
+        # successors of v that can continue a cycle through s
+        follow = lambda v: [w for w in succ[v] if w >= s and component_of[w] == component_of[s]]
+        path = [s]
+        on_path = set([s])
+        # stack of iterators over the successors still to try at each depth
+        stack = [iter(follow(s))]
+        while stack:
+            w = next(stack[-1], None)
+            if w is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            if w == s:
+                yield list(path)
+            elif w not in on_path and (max_length is None or len(path) < max_length):
+                path.append(w)
+                on_path.add(w)
+                stack.append(iter(follow(w)))
@@ -0,0 +1,146 @@
+"""
+Worklist fixpoint engine for the defence function
+
+Works on the index level of a CSRGraph (see csr_graph.py). Instead of recomputing
+d(S) = {a : a^- is a subset of S^+} from scratch, every argument keeps a counter of
+its attackers that are not (yet) attacked, and only the counters touched by a change
+are updated. This gives the grounded extension / labelling in O(|A| + |R|).
+"""
+
+# The three labels of a labelling
+IN = "IN"
+OUT = "OUT"
+UNDEC = "UNDEC"
+
+# Grounded labelling, as a list of labels indexed like the graph
+def grounded_labels(graph):
+    """
+    Input: CSRGraph
+    Output: list of labels, label[i] is IN, OUT or UNDEC for the argument with index i
+    An argument becomes IN once all its attackers are OUT (its undefeated attacker counter
+    hits 0), and OUT once one of its attackers is IN; what is left is UNDEC
+    """
+    n = len(graph)
+    succ = graph.succ
+    succ_offsets = graph.succ_offsets
+    pred_offsets = graph.pred_offsets
+    undefeated = [pred_offsets[i + 1] - pred_offsets[i] for i in xrange(n)]
+    label = [UNDEC] * n
+    worklist = [i for i in xrange(n) if undefeated[i] == 0]
+    for i in worklist:
+        label[i] = IN
+    while worklist:
+        i = worklist.pop()
+        for k in xrange(succ_offsets[i], succ_offsets[i + 1]):
+            j = succ[k]
+            if label[j] is not UNDEC:
+                continue
+            label[j] = OUT
+            # j is defeated, so everything j attacks loses an undefeated attacker
+            for l in xrange(succ_offsets[j], succ_offsets[j + 1]):
+                victim = succ[l]
+                undefeated[victim] -= 1
+                if undefeated[victim] == 0 and label[victim] is UNDEC:
+                    label[victim] = IN
+                    worklist.append(victim)
+    return label
+
+# Iterate the defence function S, d(S), d^2(S), ... lazily
+def iterate_defence(graph, start):
+    """
+    Input: CSRGraph, iterable of argument indices S
+    Output: generator of the frozensets of indices S, d(S), d^2(S), ..., stopping
+    just before the first set that has already been produced (a fixed point or a cycle)
+    Between two steps only the arguments entering or leaving the set are processed
+    """
+    n = len(graph)
+    succ = graph.succ
+    succ_offsets = graph.succ_offsets
+    pred_offsets = graph.pred_offsets
+    # hits[v] = |v^- cap S|, so v is in S^+ iff hits[v] > 0
+    hits = [0] * n
+    # unanswered[a] = |a^- minus S^+|, so a is in d(S) iff unanswered[a] == 0
+    unanswered = [pred_offsets[i + 1] - pred_offsets[i] for i in xrange(n)]
+    defended = set(i for i in xrange(n) if unanswered[i] == 0)
+
+    # S gains (change = 1) or loses (change = -1) the argument i
+    def update(i, change):
+        for k in xrange(succ_offsets[i], succ_offsets[i + 1]):
+            v = succ[k]
+            hits[v] += change
+            # v enters or leaves S^+, which changes the counters of its victims
+            if (change == 1 and hits[v] == 1) or (change == -1 and hits[v] == 0):
+                for l in xrange(succ_offsets[v], succ_offsets[v + 1]):
+                    a = succ[l]
+                    unanswered[a] -= change
+                    if unanswered[a] == 0:
+                        defended.add(a)
+                    elif change == -1 and unanswered[a] == 1:
+                        defended.discard(a)
+
+    current = frozenset(start)
+    for i in current:
+        update(i, 1)
+    seen = set()
+    while current not in seen:
+        seen.add(current)
+        yield current
+        following = frozenset(defended)
+        for i in following - current:
+            update(i, 1)
+        for i in current - following:
+            update(i, -1)
+        current = following
+
+# Redo the grounded labelling inside region, keeping the labels outside it
+def update_grounded_labels(graph, label, region):
+    """
+    Input: CSRGraph, list of labels (changed in place), indices of the arguments to relabel
+    The region must contain every argument attacked from inside it (e.g. everything
+    downstream of a changed attack), so the labels outside it are still grounded
+    Attackers outside the region are fixed: an IN one makes its victim OUT, an UNDEC one
+    keeps its victim from becoming IN, an OUT one does not count
+    """
+    succ = graph.succ
+    succ_offsets = graph.succ_offsets
+    pred = graph.pred
+    pred_offsets = graph.pred_offsets
+    region = set(region)
+    for i in region:
+        label[i] = UNDEC
+    undefeated = {}
+    defeated = set()
+    worklist = []
+    for i in region:
+        count = 0
+        for k in xrange(pred_offsets[i], pred_offsets[i + 1]):
+            y = pred[k]
+            if y in region or label[y] is UNDEC:
+                count += 1
+            elif label[y] is IN:
+                defeated.add(i)
+        undefeated[i] = count
+    # i is defeated, so everything i attacks loses an undefeated attacker
+    def defeat(i):
+        label[i] = OUT
+        for l in xrange(succ_offsets[i], succ_offsets[i + 1]):
+            victim = succ[l]
+            undefeated[victim] -= 1
+            if undefeated[victim] == 0 and label[victim] is UNDEC:
+                label[victim] = IN
+                worklist.append(victim)
+    # label all of them OUT before any victim is considered for IN
+    for i in defeated:
+        label[i] = OUT
+    for i in defeated:
+        defeat(i)
+    for i in region:
+        if undefeated[i] == 0 and label[i] is UNDEC:
+            label[i] = IN
+            worklist.append(i)
+    while worklist:
+        i = worklist.pop()
+        for k in xrange(succ_offsets[i], succ_offsets[i + 1]):
+            j = succ[k]
+            if label[j] is UNDEC:
+                defeat(j)
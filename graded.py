@@ -0,0 +1,127 @@
+"""
+Graded acceptability (Grossi and Modgil, IJCAI 2015)
+
+For a set S and m, n >= 1
+    n_m(S)   = the arguments with fewer than m attackers in S         (graded neutrality)
+    d^m_n(S) = n_m(n_n(S))                                             (graded defence)
+i.e. d^m_n(S) holds the arguments with fewer than m attackers that are not attacked by at
+least n members of S. d^1_1 is Dung's defence function. d^m_n is monotone, so it has a
+least fixed point, the graded grounded extension G(m, n), which grows with m and shrinks
+as n grows.
+
+    graded_grounded       G(m, n) for one grade, by a worklist over attacker counts:
+                          every argument keeps the number of its attackers in S and the
+                          number of its attackers not yet attacked n times by S, and these
+                          only change when an argument joins S, so the fixed point costs
+                          O(|A| + |R|)
+    graded_grounded_grid  G(m, n) for all 1 <= m, n <= k (default the largest in-degree)
+                          at once: with numpy the k grades (m, 1), ..., (m, k) are iterated
+                          together, each round counting attackers for the grades not yet at
+                          their fixed point with cumulative sums over the attacks, a chunk
+                          of grades at a time so that the sums of a chunk fit in
+                          MEMORY_BUDGET bytes. G(m - 1, n) is inside G(m, n) and inside its
+                          image under d^m_n, so the iteration for m starts from the results
+                          for m - 1 rather than from the empty set. Without numpy, or if
+                          one grade alone does not fit, one worklist per grade
+
+Works on a CSRGraph (see csr_graph.py): graph.pred holds the attackers of every argument,
+grouped by argument with graph.pred_offsets.
+"""
+
+from collections import deque
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+# Bytes the numpy grid may use at once for the attacker counts of a chunk of grades
+MEMORY_BUDGET = 1 << 28
+
+# Number of attackers of every argument
+def in_degrees(graph):
+    offsets = graph.pred_offsets
+    return [offsets[i + 1] - offsets[i] for i in xrange(len(graph))]
+
+# Largest number of attackers of an argument, at least 1
+def max_grade(graph):
+    return max([1] + in_degrees(graph))
+
+# The graded grounded extension G(m, n), as a list of booleans indexed like the graph
+def graded_grounded(graph, m, n):
+    """
+    Input: CSRGraph, integers m, n >= 1
+    Output: list of booleans, True for the arguments in the least fixed point of d^m_n
+    """
+    size = len(graph)
+    offsets = graph.succ_offsets
+    succ = graph.succ
+    inside = [False] * size
+    # attackers in S, and attackers not (yet) attacked by n members of S
+    hits = [0] * size
+    live = in_degrees(graph)
+    queue = deque([a for a in xrange(size) if live[a] < m])
+    for a in queue:
+        inside[a] = True
+    while queue:
+        x = queue.popleft()
+        for k in xrange(offsets[x], offsets[x + 1]):
+            y = succ[k]
+            hits[y] += 1
+            if hits[y] != n:
+                continue
+            # y is now attacked n times by S, so it no longer counts against its victims
+            for l in xrange(offsets[y], offsets[y + 1]):
+                a = succ[l]
+                live[a] -= 1
+                if live[a] < m and not inside[a]:
+                    inside[a] = True
+                    queue.append(a)
+    return inside
+
+# G(m, n) for all 1 <= m, n <= grades
+def graded_grounded_grid(graph, grades = None):
+    """
+    Output: list of lists, answer[m - 1][n - 1] is graded_grounded(graph, m, n)
+    """
+    grades = max_grade(graph) if grades is None else grades
+    size = len(graph)
+    # per grade: the running sums and the gathered attacks, then the counts per argument
+    row_bytes = 5 * (len(graph.pred) + 1) + 16 * size
+    chunk = MEMORY_BUDGET // row_bytes
+    if not HAVE_NUMPY or chunk < 1:
+        return [[graded_grounded(graph, m, n) for n in xrange(1, grades + 1)] for m in xrange(1, grades + 1)]
+    attackers = np.asarray(graph.pred, dtype = np.int64)
+    offsets = np.asarray(graph.pred_offsets, dtype = np.int64)
+    # one row per grade (m, n), m major
+    m_values = np.repeat(np.arange(1, grades + 1), grades)[:, None]
+    n_values = np.tile(np.arange(1, grades + 1), grades)[:, None]
+    rows = grades * grades
+
+    # number of attackers in the set, for every row and argument
+    def count(chosen):
+        running = np.zeros((len(chosen), len(attackers) + 1), dtype = np.int32)
+        np.cumsum(chosen[:, attackers], axis = 1, out = running[:, 1:])
+        return running[:, offsets[1:]] - running[:, offsets[:-1]]
+
+    inside = np.zeros((rows, size), dtype = bool)
+    for m in xrange(1, grades + 1):
+        block = np.arange((m - 1) * grades, m * grades)
+        if m > 1:
+            inside[block] = inside[block - grades]
+        # the rows that have not reached their fixed point yet
+        active = block
+        while len(active):
+            unfinished = []
+            for start in xrange(0, len(active), chunk):
+                part = active[start:start + chunk]
+                current = inside[part]
+                live = ~(count(current) >= n_values[part])
+                following = count(live) < m_values[part]
+                changed = (following != current).any(axis = 1)
+                inside[part] = following
+                unfinished.append(part[changed])
+            active = np.concatenate(unfinished)
+    return [[inside[(m - 1) * grades + n - 1].tolist() for n in xrange(1, grades + 1)]
+            for m in xrange(1, grades + 1)]
@@ -0,0 +1,258 @@
+"""
+Readers and writers for the ICCMA competition file formats
+
+    tgf   Trivial Graph Format: one argument name per line, a line "#", then one attack
+          "a b" per line
+    apx   ASPARTIX: facts arg(a). and att(a,b). (any number per line)
+    i23   ICCMA 2023: a header "p af n", then one attack "i j" per line, where the
+          arguments are the numbers 1, ..., n; lines starting with "#" are comments
+
+The readers stream through the file once, numbering arguments as they first appear and
+appending attacks to two integer arrays, which go straight into a CSRGraph (see
+csr_graph.py) without any per-attack Python tuple. On a malformed line they return the
+error message "invalid format: line k: ..." instead. The writers go through the CSR arrays.
+
+A source or target is a file name or an open file object.
+"""
+
+import re
+from array import array
+from itertools import islice
+
+from csr_graph import CSRGraph, INDEX_TYPE
+
+TGF = "tgf"
+APX = "apx"
+I23 = "i23"
+FORMATS = (TGF, APX, I23)
+
+# Lines converted at once by read_i23
+BLOCK_LINES = 65536
+
+# File extension --> format
+EXTENSIONS = {".tgf": TGF, ".apx": APX, ".i23": I23, ".af": I23}
+
+# One arg(a). or att(a,b). fact
+APX_FACT = re.compile(r"(arg|att)\s*\(\s*([^,()\s]+)\s*(?:,\s*([^,()\s]+)\s*)?\)\s*\.")
+
+# Format of a file name from its extension, or None
+def guess_format(path):
+    for extension, fmt in EXTENSIONS.items():
+        if path.lower().endswith(extension):
+            return fmt
+    return None
+
+# Lines of a file name or file object
+def _lines(source):
+    if hasattr(source, "read"):
+        for line in source:
+            yield line
+        return
+    with open(source) as handle:
+        for line in handle:
+            yield line
+
+# Collects arguments and attacks as index arrays
+class _Builder(object):
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.sources = array(INDEX_TYPE)
+        self.targets = array(INDEX_TYPE)
+
+    def argument(self, name):
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def attack(self, u, v):
+        self.sources.append(self.argument(u))
+        self.targets.append(self.argument(v))
+
+    def graph(self):
+        return CSRGraph.from_index_arrays(self.names, self.sources, self.targets)
+
+"""
+Readers: source --> CSRGraph
+"""
+
+def read_tgf(source):
+    """
+    Output: CSRGraph, or an error message "invalid format: line k: ..."
+    """
+    builder = _Builder()
+    attacks = False
+    for line_number, line in enumerate(_lines(source), 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            attacks = True
+            continue
+        if attacks:
+            # anything after the two arguments is an edge label
+            parts = line.split()
+            if len(parts) < 2:
+                return "invalid format: line %d: expected an attack a b" % line_number
+            builder.attack(parts[0], parts[1])
+        else:
+            builder.argument(line.split()[0])
+    return builder.graph()
+
+def read_apx(source):
+    """
+    Output: CSRGraph, or an error message "invalid format: line k: ..."
+    """
+    builder = _Builder()
+    for line_number, line in enumerate(_lines(source), 1):
+        # comments start with % as in ASP
+        line = line.split("%", 1)[0]
+        position = 0
+        for match in APX_FACT.finditer(line):
+            kind, first, second = match.groups()
+            if line[position:match.start()].strip():
+                break
+            if kind == "arg" and second is not None:
+                return "invalid format: line %d: arg takes one argument" % line_number
+            if kind == "att" and second is None:
+                return "invalid format: line %d: att takes two arguments" % line_number
+            if kind == "arg":
+                builder.argument(first)
+            else:
+                builder.attack(first, second)
+            position = match.end()
+        rest = line[position:].strip()
+        if rest:
+            return "invalid format: line %d: expected arg(a). or att(a,b). at %s" % (line_number, rest.split()[0])
+    return builder.graph()
+
+def read_i23(source):
+    """
+    The arguments are the integers 1, ..., n, with index i - 1 for argument i
+    The attack lines are converted in blocks of BLOCK_LINES, one split and one int
+    conversion per block, which is much faster than line by line; only a block that fails
+    the checks is gone through line by line, to name the offending line
+    Output: CSRGraph, or an error message "invalid format: line k: ..."
+    """
+    names = None
+    numbers = array(INDEX_TYPE)
+    lines = _lines(source)
+    line_number = 0
+    while True:
+        block = list(islice(lines, BLOCK_LINES))
+        if not block:
+            break
+        attacks = []
+        attack_lines = []
+        for line in block:
+            line_number += 1
+            first = line.lstrip()[:1]
+            if first == "p":
+                parts = line.split()
+                if len(parts) != 3 or parts[1] != "af" or not parts[2].isdigit():
+                    return "invalid format: line %d: expected the header p af n" % line_number
+                names = range(1, int(parts[2]) + 1)
+            elif first and first != "#":
+                if names is None:
+                    return "invalid format: line %d: attack before the header p af n" % line_number
+                attacks.append(line)
+                attack_lines.append(line_number)
+        try:
+            values = array(INDEX_TYPE, map(int, " ".join(attacks).split()))
+        except ValueError:
+            values = None
+        if values is None or len(values) != 2 * len(attacks) or (values and (min(values) < 1 or max(values) > len(names))):
+            for line, number in zip(attacks, attack_lines):
+                problem = _i23_attack_error(line, len(names))
+                if problem:
+                    return "invalid format: line %d: %s" % (number, problem)
+        numbers.extend(values)
+    if names is None:
+        return "invalid format: no header p af n"
+    sources = array(INDEX_TYPE, [i - 1 for i in numbers[0::2]])
+    targets = array(INDEX_TYPE, [j - 1 for j in numbers[1::2]])
+    return CSRGraph.from_index_arrays(names, sources, targets)
+
+# What is wrong with an i23 attack line, or None
+def _i23_attack_error(line, n):
+    parts = line.split()
+    if len(parts) != 2:
+        return "expected an attack i j"
+    for part in parts:
+        if not part.isdigit():
+            return "%s is not an argument number" % part
+        if not 1 <= int(part) <= n:
+            return "argument %s not in 1..%d" % (part, n)
+    return None
+
+READERS = {TGF: read_tgf, APX: read_apx, I23: read_i23}
+
+# Read a file in any of the formats, guessed from the extension if fmt is None
+def read_af(source, fmt = None):
+    """
+    Output: CSRGraph, or an error message starting with "invalid format"
+    """
+    if fmt is None and not hasattr(source, "read"):
+        fmt = guess_format(source)
+    if fmt not in READERS:
+        return "invalid format"
+    return READERS[fmt](source)
+
+"""
+Writers: CSRGraph --> target
+"""
+
+# Write lines to a file name or file object
+def _write(target, lines):
+    if hasattr(target, "write"):
+        for line in lines:
+            target.write(line)
+        return
+    with open(target, "w") as handle:
+        for line in lines:
+            handle.write(line)
+
+def _tgf_lines(graph):
+    names = graph.names
+    for name in names:
+        yield "%s\n" % (name,)
+    yield "#\n"
+    for i, j in graph.index_edges():
+        yield "%s %s\n" % (names[i], names[j])
+
+def _apx_lines(graph):
+    names = graph.names
+    for name in names:
+        yield "arg(%s).\n" % (name,)
+    for i, j in graph.index_edges():
+        yield "att(%s,%s).\n" % (names[i], names[j])
+
+def _i23_lines(graph):
+    """
+    The arguments are numbered by their index, the argument with index i becomes i + 1
+    """
+    yield "p af %d\n" % len(graph)
+    for i, j in graph.index_edges():
+        yield "%d %d\n" % (i + 1, j + 1)
+
+WRITERS = {TGF: _tgf_lines, APX: _apx_lines, I23: _i23_lines}
+
+def write_tgf(graph, target):
+    _write(target, _tgf_lines(graph))
+
+def write_apx(graph, target):
+    _write(target, _apx_lines(graph))
+
+def write_i23(graph, target):
+    _write(target, _i23_lines(graph))
+
+# Write a CSRGraph in any of the formats, guessed from the extension if fmt is None
+def write_af(graph, target, fmt = None):
+    if fmt is None and not hasattr(target, "write"):
+        fmt = guess_format(target)
+    if fmt not in WRITERS:
+        return "invalid format"
+    _write(target, WRITERS[fmt](graph))
@@ -0,0 +1,196 @@
+"""
+Command line solver following the ICCMA solver interface
+
+    python iccma_solver.py                                      author and version
+    python iccma_solver.py --formats                            supported file formats
+    python iccma_solver.py --problems                           supported problems
+    python iccma_solver.py -p DC-PR -f af.apx -fo apx -a a1     solve one problem
+
+A problem is TASK-SEMANTICS, with the tasks
+    DC  is the argument credulously accepted?       YES / NO
+    DS  is the argument skeptically accepted?        YES / NO
+    SE  some extension                               the extension, or NO if there is none
+    EE  all extensions                               the list of extensions
+    CE  the number of extensions                     an integer
+and the semantics CO (complete), PR (preferred), ST (stable), GR (grounded),
+SST (semi-stable), STG (stage), ID (ideal) and EG (eager).
+
+Only the requested problem is computed, by the cheapest routine Absargfw has for it: the
+grounded extension answers DS-CO, DC-GR, DS-GR and SE-CO in linear time, DC and DS go
+through credulously_accepted / skeptically_accepted (which only look at the relevant
+slice of the AF), and SE stops at the first extension found.
+
+Output follows ICCMA 2017-2021 ([a1,a2], [[a1],[a2]]) for tgf and apx input, and ICCMA
+2023 ("w 1 2") for i23 input.
+"""
+
+import sys
+import argparse
+
+import iccma_io
+from basic_abs_arg import Absargfw, ENGINES, ACCEPTANCE_ENGINES
+
+AUTHOR = "Anthony Peter Young"
+VERSION = "basic_abs_arg ICCMA solver 1.0"
+
+TASKS = ("DC", "DS", "SE", "EE", "CE")
+SEMANTICS = ("CO", "PR", "ST", "GR", "SST", "STG", "ID", "EG")
+
+# Semantics with a single extension
+SINGLE_STATUS = ("GR", "ID", "EG")
+
+# ICCMA semantics --> name used by credulously_accepted / skeptically_accepted
+ACCEPTANCE_NAMES = {"CO": "complete", "PR": "preferred", "ST": "stable", "GR": "grounded"}
+
+# All supported problems, e.g. "DC-PR"
+def problems():
+    return ["%s-%s" % (task, semantics) for task in TASKS for semantics in SEMANTICS]
+
+"""
+Lazily listing the extensions of a semantics
+"""
+
+def iter_extensions(af, semantics, engine):
+    if semantics == "CO":
+        return af.iter_comp(engine)
+    if semantics == "PR":
+        return af.iter_pref(engine)
+    if semantics == "ST":
+        return af.iter_stab(engine)
+    if semantics == "SST":
+        return af.iter_semi_stab()
+    if semantics == "STG":
+        return af.iter_stage()
+    if semantics == "GR":
+        return iter([af.grounded()])
+    if semantics == "ID":
+        return iter([af.ideal()])
+    return iter([af.eager()])
+
+"""
+The tasks, each returning True / False, an extension or None, a list or a number
+"""
+
+# Engine for credulously_accepted / skeptically_accepted, which have no SCC engine
+def acceptance_engine(engine):
+    return engine if engine in ACCEPTANCE_ENGINES else "labelling"
+
+def credulous(af, semantics, argument, engine):
+    if semantics == "GR":
+        return argument in af.grounded()
+    if semantics in ACCEPTANCE_NAMES:
+        return af.credulously_accepted(argument, ACCEPTANCE_NAMES[semantics], acceptance_engine(engine))
+    if semantics in SINGLE_STATUS:
+        return argument in next(iter_extensions(af, semantics, engine))
+    return any(argument in extension for extension in iter_extensions(af, semantics, engine))
+
+def skeptical(af, semantics, argument, engine):
+    # the grounded extension is the intersection of all complete extensions
+    if semantics in ("CO", "GR"):
+        return argument in af.grounded()
+    if semantics in ACCEPTANCE_NAMES:
+        return af.skeptically_accepted(argument, ACCEPTANCE_NAMES[semantics], acceptance_engine(engine))
+    return all(argument in extension for extension in iter_extensions(af, semantics, engine))
+
+def some_extension(af, semantics, engine):
+    # the grounded extension is complete
+    if semantics == "CO":
+        return af.grounded()
+    return next(iter_extensions(af, semantics, engine), None)
+
+def all_extensions(af, semantics, engine):
+    return list(iter_extensions(af, semantics, engine))
+
+def count_extensions(af, semantics, engine):
+    return sum(1 for extension in iter_extensions(af, semantics, engine))
+
+def solve(af, problem, argument = None, engine = "labelling"):
+    """
+    Input: Absargfw, problem such as "DC-PR", argument for DC and DS, engine
+    Output: the answer as a Python value, or an error message
+    """
+    task, semantics = problem.split("-", 1) if "-" in problem else (problem, None)
+    if task not in TASKS or semantics not in SEMANTICS:
+        return "invalid problem"
+    if engine not in ENGINES:
+        return "invalid engine"
+    if task in ("DC", "DS"):
+        if argument not in af.graph:
+            return "invalid argument"
+        if task == "DC":
+            return credulous(af, semantics, argument, engine)
+        return skeptical(af, semantics, argument, engine)
+    if task == "SE":
+        return some_extension(af, semantics, engine)
+    if task == "EE":
+        return all_extensions(af, semantics, engine)
+    return count_extensions(af, semantics, engine)
+
+"""
+Output
+"""
+
+def format_extension(extension, style):
+    names = sorted(extension)
+    if style == iccma_io.I23:
+        return " ".join(["w"] + [str(name) for name in names])
+    return "[" + ",".join([str(name) for name in names]) + "]"
+
+def format_answer(answer, task, style):
+    if task in ("DC", "DS"):
+        return "YES" if answer else "NO"
+    if task == "CE":
+        return str(answer)
+    if task == "SE":
+        if answer is None:
+            return "NO"
+        return format_extension(answer, style)
+    if style == iccma_io.I23:
+        return "\n".join([format_extension(extension, style) for extension in answer])
+    return "[" + ",".join([format_extension(extension, style) for extension in answer]) + "]"
+
+def main(argv = None, out = sys.stdout):
+    parser = argparse.ArgumentParser(description = "ICCMA solver interface to basic_abs_arg")
+    parser.add_argument("-p", "--problem")
+    parser.add_argument("-f", "--file")
+    parser.add_argument("-fo", "--format")
+    parser.add_argument("-a", "--argument")
+    parser.add_argument("--engine", default = "labelling", choices = ENGINES)
+    parser.add_argument("--formats", action = "store_true")
+    parser.add_argument("--problems", action = "store_true")
+    args = parser.parse_args(argv)
+
+    if args.formats:
+        out.write("[%s]\n" % ",".join(iccma_io.FORMATS))
+        return 0
+    if args.problems:
+        out.write("[%s]\n" % ",".join(problems()))
+        return 0
+    if args.problem is None:
+        out.write("%s\n%s\n" % (VERSION, AUTHOR))
+        return 0
+    if args.file is None:
+        parser.error("-f is required with -p")
+
+    fmt = args.format or iccma_io.guess_format(args.file)
+    af = Absargfw.from_file(args.file, fmt)
+    if not isinstance(af, Absargfw):
+        out.write("%s\n" % af)
+        return 1
+    argument = args.argument
+    if argument is not None and fmt == iccma_io.I23:
+        # i23 arguments are numbers
+        try:
+            argument = int(argument)
+        except ValueError:
+            out.write("invalid argument\n")
+            return 1
+    answer = solve(af, args.problem, argument, args.engine)
+    if isinstance(answer, str):
+        out.write("%s\n" % answer)
+        return 1
+    out.write("%s\n" % format_answer(answer, args.problem.split("-")[0], fmt))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
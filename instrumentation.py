@@ -0,0 +1,134 @@
+"""
+Instrumentation of Absargfw: call counts and times of the core operators, enumeration
+statistics, and a profile of every query
+
+A Profiler is attached with Absargfw.enable_profiling() (or Absargfw(..., profiler = p)).
+While one is attached
+    operators   every call of the public operators decorated with @timed (set_plus,
+                set_minus, defence, neutrality, conflict_free) is counted and timed; the
+                mask operators and enumeration loops inside the queries are not, so
+                that they stay as fast as without instrumentation
+    counters    the enumeration engines add to named counters, see COUNTERS
+    queries     every call of a cached method (all_comp, grounded, ...) gets a profile:
+                its name and arguments, whether it was a cache hit, its time, and the
+                operator calls and counters it caused (including those of nested queries)
+With no profiler attached the cost is one extra function call and attribute test per
+call of a public operator.
+
+Counters of the lazy iter_* methods grow as their generators are consumed. The SAT engine
+and the parallel search (processes other than 1) do not report counters.
+"""
+
+import json
+import time
+from functools import wraps
+from collections import defaultdict
+
+# Counters the enumeration engines report
+SUBSETS_VISITED = "subsets_visited"         # candidate subsets tested by the powerset methods
+LABELLINGS_VISITED = "labellings_visited"   # nodes of the labelling search tree
+BRANCHES_PRUNED = "branches_pruned"         # labelling branches closed by propagation
+EXTENSIONS_FOUND = "extensions_found"       # extensions (subsets or labellings) found
+COUNTERS = (SUBSETS_VISITED, LABELLINGS_VISITED, BRANCHES_PRUNED, EXTENSIONS_FOUND)
+
+# Add k to a counter, if stats (a dict of counters or None) is given
+def bump(stats, name, k = 1):
+    if stats is not None:
+        stats[name] += k
+
+class Profiler(object):
+
+    def __init__(self):
+        self.reset()
+
+    # Forget everything recorded
+    def reset(self):
+        # operator name --> number of calls, total seconds
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.queries = []
+        self._depth = 0
+
+    # One timed operator call
+    def record(self, name, seconds):
+        self.calls[name] += 1
+        self.seconds[name] += seconds
+
+    # Snapshot of the operator calls and counters, to take differences
+    def _snapshot(self):
+        return dict(self.calls), dict(self.seconds), dict(self.counters)
+
+    # Profile a query: call begin before it and end after it
+    def begin(self):
+        self._depth += 1
+        return self._snapshot(), time.time()
+
+    # token is what begin returned, hit tells whether the result came from the cache
+    def end(self, token, name, args, hit):
+        (calls, seconds, counters), start = token
+        elapsed = time.time() - start
+        self._depth -= 1
+        self.queries.append({
+            "query": name,
+            "args": [repr(arg) for arg in args],
+            "cache_hit": hit,
+            "seconds": elapsed,
+            "depth": self._depth,
+            "operators": dict((op, {"calls": self.calls[op] - calls.get(op, 0),
+                                    "seconds": self.seconds[op] - seconds.get(op, 0.0)})
+                              for op in self.calls if self.calls[op] != calls.get(op, 0)),
+            "counters": dict((key, self.counters[key] - counters.get(key, 0))
+                             for key in self.counters if self.counters[key] != counters.get(key, 0)),
+        })
+
+    # Operators from the most to the least total time
+    def hot_operators(self):
+        """
+        Output: list of (name, calls, total seconds, mean seconds per call)
+        """
+        answer = [(name, self.calls[name], self.seconds[name], self.seconds[name] / self.calls[name])
+                  for name in self.calls]
+        answer.sort(key = lambda row: -row[2])
+        return answer
+
+    # Everything recorded as plain dicts and lists
+    def to_dict(self):
+        return {
+            "operators": dict((name, {"calls": calls, "seconds": total, "mean": mean})
+                              for name, calls, total, mean in self.hot_operators()),
+            "counters": dict(self.counters),
+            "queries": list(self.queries),
+        }
+
+    # Write to_dict() as JSON to a file name or file object
+    def to_json(self, target):
+        if hasattr(target, "write"):
+            json.dump(self.to_dict(), target, indent = 2, sort_keys = True)
+            return
+        with open(target, "w") as handle:
+            json.dump(self.to_dict(), handle, indent = 2, sort_keys = True)
+
+    # Human readable summary
+    def report(self):
+        lines = ["%-24s %10s %12s %12s" % ("operator", "calls", "seconds", "mean")]
+        for name, calls, total, mean in self.hot_operators():
+            lines.append("%-24s %10d %12.6f %12.9f" % (name, calls, total, mean))
+        for name in sorted(self.counters):
+            lines.append("%-24s %10d" % (name, self.counters[name]))
+        lines.append("%d queries profiled" % len(self.queries))
+        return "\n".join(lines)
+
+# Decorator: count and time an Absargfw operator when a profiler is attached
+def timed(method):
+    name = method.__name__
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = self.profiler
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        start = time.time()
+        answer = method(self, *args, **kwargs)
+        profiler.record(name, time.time() - start)
+        return answer
+    return wrapper
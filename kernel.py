@@ -0,0 +1,110 @@
+"""
+Preprocessing: shrinking an AF before enumeration
+
+Two steps, both preserving the extensions of the semantics asked for:
+
+1. Kernels (Oikarinen and Woltran 2011) drop attacks that make no difference. An attack
+   (a, b) with a != b is dropped from
+        the stable kernel       if a attacks itself
+        the admissible kernel   if a attacks itself and b attacks a or itself
+        the complete kernel     if a and b both attack themselves
+   An AF and its kernel have the same extensions: the stable kernel serves stable and
+   stage semantics, the admissible kernel preferred and semi-stable semantics, the
+   complete kernel complete semantics.
+
+2. Grounded reduction, for the semantics whose extensions are complete extensions
+   (complete, preferred, stable, semi-stable): every complete labelling agrees with the
+   grounded labelling on the arguments it labels IN or OUT, and the complete labellings
+   are exactly the grounded labelling joined with a complete labelling of the subframework
+   of the grounded UNDEC arguments (their IN attackers do not exist and their OUT attackers
+   do not matter). So only that residual subframework is searched, and every extension E
+   found lifts back to E U grounded extension; preferred, stable and semi-stable extensions
+   correspond in the same way, since the grounded part adds the same arguments to every
+   extension and to every range. Dropping attacks in step 1 often leaves more arguments
+   unattacked, so more of the AF is settled here.
+
+Self-attacking arguments are never IN; they stay in the residual only if they are UNDEC.
+
+Works on a CSRGraph (see csr_graph.py).
+"""
+
+from array import array
+
+import fixpoint
+from csr_graph import CSRGraph, INDEX_TYPE
+
+COMPLETE = "complete"
+PREFERRED = "preferred"
+STABLE = "stable"
+SEMI_STABLE = "semi_stable"
+STAGE = "stage"
+
+# Kernel functions: (attack (a, b), self-attacking flags) --> keep the attack?
+def _stable_keep(a, b, loop, attacks):
+    return not loop[a]
+
+def _admissible_keep(a, b, loop, attacks):
+    return not (loop[a] and ((b, a) in attacks or loop[b]))
+
+def _complete_keep(a, b, loop, attacks):
+    return not (loop[a] and loop[b])
+
+# The kernel of an AF, as a new CSRGraph on the same arguments
+def _kernel(graph, keep):
+    n = len(graph)
+    offsets = graph.succ_offsets
+    succ = graph.succ
+    attacks = set()
+    loop = [False] * n
+    for i in xrange(n):
+        for k in xrange(offsets[i], offsets[i + 1]):
+            attacks.add((i, succ[k]))
+            if succ[k] == i:
+                loop[i] = True
+    sources = array(INDEX_TYPE)
+    targets = array(INDEX_TYPE)
+    for i in xrange(n):
+        for k in xrange(offsets[i], offsets[i + 1]):
+            j = succ[k]
+            if i == j or keep(i, j, loop, attacks):
+                sources.append(i)
+                targets.append(j)
+    return CSRGraph.from_index_arrays(list(graph.names), sources, targets)
+
+def stable_kernel(graph):
+    return _kernel(graph, _stable_keep)
+
+def admissible_kernel(graph):
+    return _kernel(graph, _admissible_keep)
+
+def complete_kernel(graph):
+    return _kernel(graph, _complete_keep)
+
+# Semantics --> the kernel that preserves its extensions
+KERNELS = {
+    COMPLETE: complete_kernel,
+    PREFERRED: admissible_kernel,
+    STABLE: stable_kernel,
+    SEMI_STABLE: admissible_kernel,
+    STAGE: stable_kernel,
+}
+
+# Semantics whose extensions are complete extensions, so grounded reduction applies
+REDUCIBLE = (COMPLETE, PREFERRED, STABLE, SEMI_STABLE)
+
+# Shrink an AF for a semantics
+def preprocess(graph, semantics):
+    """
+    Input: CSRGraph, one of the semantics in KERNELS
+    Output: (residual CSRGraph, list of the arguments in every extension); the extensions
+    of the AF are the extensions of the residual, each joined with that list
+    For the semantics not in REDUCIBLE the residual is the kernel and the list is empty
+    """
+    kernel = KERNELS[semantics](graph)
+    if semantics not in REDUCIBLE:
+        return kernel, []
+    labels = fixpoint.grounded_labels(kernel)
+    names = kernel.names
+    fixed = [names[i] for i, label in enumerate(labels) if label is fixpoint.IN]
+    undecided = [names[i] for i, label in enumerate(labels) if label is fixpoint.UNDEC]
+    return kernel.subgraph(undecided), fixed
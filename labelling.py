@@ -0,0 +1,214 @@
+"""
+Labelling-based enumeration of complete, preferred and stable extensions
+
+In the style of the labelling algorithms of Modgil and Caminada: every argument is
+labelled IN, OUT or UNDEC, where in a complete labelling
+    a is IN    iff all attackers of a are OUT
+    a is OUT   iff some attacker of a is IN
+    a is UNDEC iff no attacker of a is IN and some attacker of a is UNDEC
+and the IN arguments are the complete extension.
+
+Works on successor / predecessor index lists (see CSRGraph.adjacency_lists). Every
+argument has a domain of labels it may still take, a bitmask of IN_BIT, OUT_BIT and
+UNDEC_BIT. The search picks an argument with more than one possible label, tries each
+label in turn, and after every choice propagates the rules above to a fixed point,
+removing labels that can no longer be legal. A branch is abandoned as soon as some
+argument has no legal label left.
+"""
+
+from collections import deque
+
+from instrumentation import bump, LABELLINGS_VISITED, BRANCHES_PRUNED
+
+# Label bits, a domain is a union of these
+IN_BIT = 1
+OUT_BIT = 2
+UNDEC_BIT = 4
+ANY = IN_BIT | OUT_BIT | UNDEC_BIT
+
+# Propagate the labelling rules until nothing changes
+def propagate(succ, pred, dom, checked, start):
+    """
+    Input: successor and predecessor lists, list of domains dom (changed in place),
+    list of booleans checked (False for arguments whose own rule is not enforced, e.g.
+    arguments outside the part of the AF being searched), iterable of indices to revise
+    Output: False if some domain becomes empty, True otherwise
+    """
+    queue = deque(start)
+    queued = set(queue)
+
+    # the domain of y shrinks to new, so y's rule and the rules of its victims need revising
+    def narrow(y, new):
+        if new == dom[y]:
+            return True
+        dom[y] = new
+        if not new:
+            return False
+        if y not in queued:
+            queued.add(y)
+            queue.append(y)
+        for v in succ[y]:
+            if v not in queued:
+                queued.add(v)
+                queue.append(v)
+        return True
+
+    while queue:
+        x = queue.popleft()
+        queued.discard(x)
+        if not checked[x]:
+            continue
+        attackers = pred[x]
+        # what the attackers can still be
+        all_can_out = True
+        all_can_notin = True
+        can_in = []
+        can_undec = []
+        can_notout = []
+        for y in attackers:
+            d = dom[y]
+            if d & IN_BIT:
+                can_in.append(y)
+            if d & UNDEC_BIT:
+                can_undec.append(y)
+            if not d & OUT_BIT:
+                all_can_out = False
+            if d == IN_BIT:
+                all_can_notin = False
+            if d != OUT_BIT:
+                can_notout.append(y)
+        # labels x can still take given its attackers
+        new = dom[x]
+        if not all_can_out:
+            new &= ~IN_BIT
+        if not can_in:
+            new &= ~OUT_BIT
+        if not all_can_notin or not can_undec:
+            new &= ~UNDEC_BIT
+        if not narrow(x, new):
+            return False
+        new = dom[x]
+        # labels the attackers can still take given x
+        if new == IN_BIT:
+            for y in attackers:
+                if not narrow(y, dom[y] & OUT_BIT):
+                    return False
+        if not new & OUT_BIT:
+            # nothing attacking x may be IN
+            for y in attackers:
+                if not narrow(y, dom[y] & ~IN_BIT):
+                    return False
+        if new == OUT_BIT and len(can_in) == 1:
+            # the only possible IN attacker must be IN
+            if not narrow(can_in[0], dom[can_in[0]] & IN_BIT):
+                return False
+        if new == UNDEC_BIT and len(can_undec) == 1:
+            # the only possible UNDEC attacker must be UNDEC
+            if not narrow(can_undec[0], dom[can_undec[0]] & UNDEC_BIT):
+                return False
+        if not new & IN_BIT and len(can_notout) == 1:
+            # not all attackers are OUT, and only one of them can avoid it
+            if not narrow(can_notout[0], dom[can_notout[0]] & ~OUT_BIT):
+                return False
+    return True
+
+# Branching order: the most connected arguments first, as their labels constrain the most
+def branching_order(succ, pred):
+    return sorted(xrange(len(succ)), key = lambda i: -(len(succ[i]) + len(pred[i])))
+
+# Depth-first search over labellings, yielding every complete labelling within dom
+def search(succ, pred, dom = None, checked = None, order = None, stats = None, prune = None):
+    """
+    Input: successor and predecessor lists, optional initial domains (default ANY),
+    optional list of booleans checked (default all True), optional branching order,
+    optional dict of counters (see instrumentation.py) for the nodes and pruned branches,
+    optional function domains --> True if nothing below them is wanted, tried at every node
+    Output: generator of complete labellings, as lists of label bits, one per index
+    Arguments that are not checked keep their initial domain, which must be a single label
+    The generator is lazy, so prune may depend on the labellings the caller has seen so far
+    """
+    n = len(succ)
+    dom = [ANY] * n if dom is None else list(dom)
+    checked = [True] * n if checked is None else checked
+    if order is None:
+        order = branching_order(succ, pred)
+    if not propagate(succ, pred, dom, checked, xrange(n)):
+        bump(stats, BRANCHES_PRUNED)
+        return
+    # explicit stack of (domains, position in order to look for the next choice)
+    stack = [(dom, 0)]
+    while stack:
+        dom, position = stack.pop()
+        bump(stats, LABELLINGS_VISITED)
+        if prune is not None and prune(dom):
+            bump(stats, BRANCHES_PRUNED)
+            continue
+        while position < len(order) and not dom[order[position]] & (dom[order[position]] - 1):
+            position += 1
+        if position == len(order):
+            yield dom
+            continue
+        x = order[position]
+        # pushed in reverse, so IN is tried first, then OUT, then UNDEC
+        for label in (UNDEC_BIT, OUT_BIT, IN_BIT):
+            if dom[x] & label:
+                child = list(dom)
+                child[x] = label
+                if propagate(succ, pred, child, checked, [x] + succ[x]):
+                    stack.append((child, position + 1))
+                else:
+                    bump(stats, BRANCHES_PRUNED)
+
+# All complete labellings
+def complete_labellings(succ, pred, dom = None, stats = None):
+    return search(succ, pred, dom, stats = stats)
+
+# All stable labellings, i.e. complete labellings without UNDEC
+def stable_labellings(succ, pred, dom = None, stats = None):
+    n = len(succ)
+    dom = [ANY] * n if dom is None else dom
+    return search(succ, pred, [d & ~UNDEC_BIT for d in dom], stats = stats)
+
+# Is there a complete labelling whose IN set strictly contains that of labels?
+def has_larger(succ, pred, labels, checked = None, stats = None):
+    """
+    Such a labelling keeps every IN argument IN, and hence every OUT argument OUT,
+    so only the UNDEC arguments are searched. A complete labelling is determined by its
+    IN set, so any solution other than labels itself has a strictly larger IN set
+    """
+    dom = [ANY if label == UNDEC_BIT else label for label in labels]
+    for solution in search(succ, pred, dom, checked, stats = stats):
+        if solution != labels:
+            return True
+    return False
+
+# All preferred labellings, i.e. complete labellings with maximal IN sets
+def preferred_labellings(succ, pred, dom = None, stats = None):
+    """
+    Every complete labelling found is checked for maximality with has_larger,
+    unless its IN set is already inside a preferred extension found earlier
+    """
+    found = []
+    for labels in search(succ, pred, dom, stats = stats):
+        mask = in_mask(labels)
+        if any(mask & other == mask for other in found):
+            continue
+        if not has_larger(succ, pred, labels, stats = stats):
+            found.append(mask)
+            yield labels
+
+# IN set of a labelling as a bitmask of indices
+def in_mask(labels):
+    answer = 0
+    for i, label in enumerate(labels):
+        if label == IN_BIT:
+            answer |= 1 << i
+    return answer
+
+# Range (IN and OUT arguments) of a labelling as a bitmask of indices
+def range_mask(labels):
+    answer = 0
+    for i, label in enumerate(labels):
+        if label != UNDEC_BIT:
+            answer |= 1 << i
+    return answer
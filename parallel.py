@@ -0,0 +1,145 @@
+"""
+Multi-process enumeration of extensions, by splitting the search space into independent jobs
+
+    conflict free, admissible:  the masks 0, ..., 2^n - 1 are cut into contiguous ranges,
+                                each job tests one range (see batch.py); the ranges are
+                                merged in order, so the result stays in powerlist order
+    complete, stable:           the labels of a few high degree arguments are fixed, one
+                                job per combination that survives propagation, and each
+                                job runs the labelling search below it (see labelling.py);
+                                the jobs partition the labellings, so the results are
+                                simply concatenated
+    preferred:                  as complete, each job keeping the extensions maximal within
+                                its part, then a final antichain pass over all of them
+
+The jobs run on a concurrent.futures.ProcessPoolExecutor where that module exists
+(Python 3, or the futures backport on Python 2), and on a multiprocessing.Pool otherwise.
+Jobs only receive plain data (graphs, lists, integers) so that they can be pickled.
+"""
+
+import multiprocessing
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+    HAVE_FUTURES = True
+except ImportError:
+    HAVE_FUTURES = False
+
+import batch
+import labelling
+import antichain
+from labelling import IN_BIT, OUT_BIT, UNDEC_BIT, ANY
+
+COMPLETE = "complete"
+PREFERRED = "preferred"
+STABLE = "stable"
+
+# Jobs per process, more than one so that uneven jobs balance out
+JOBS_PER_PROCESS = 4
+
+# Number of processes to use, None meaning one per CPU
+def process_count(processes = None):
+    if processes is None:
+        return multiprocessing.cpu_count()
+    return processes
+
+# Results of function on each job, in the order of the jobs
+def run_jobs(function, jobs, processes = None):
+    """
+    Input: a picklable module-level function, list of jobs, number of processes
+    Output: generator of function(job) for every job, in order
+    """
+    processes = process_count(processes)
+    if HAVE_FUTURES:
+        with ProcessPoolExecutor(max_workers = processes) as executor:
+            for result in executor.map(function, jobs):
+                yield result
+        return
+    pool = multiprocessing.Pool(processes)
+    try:
+        for result in pool.imap(function, jobs):
+            yield result
+    finally:
+        pool.terminate()
+
+"""
+Subset ranges, for conflict free and admissible sets
+"""
+
+# Tests the masks start, ..., stop - 1 of a batch condition
+def _mask_job(job):
+    graph, condition, start, stop = job
+    return list(batch.make_evaluator(graph).iter_masks(condition, start, stop))
+
+# Masks passing a batch condition, in increasing order
+def iter_masks(graph, condition, processes = None):
+    total = 1 << len(graph)
+    count = min(total, process_count(processes) * JOBS_PER_PROCESS)
+    bounds = [total * k // count for k in xrange(count + 1)]
+    jobs = [(graph, condition, bounds[k], bounds[k + 1]) for k in xrange(count)]
+    for masks in run_jobs(_mask_job, jobs, processes):
+        for mask in masks:
+            yield mask
+
+"""
+Fixed labels, for complete, stable and preferred extensions
+"""
+
+# Split the labelling search into at least count parts by fixing labels
+def split_domains(succ, pred, semantics, count):
+    """
+    Input: successor and predecessor lists, semantics, the number of parts wanted
+    Output: list of domains (see labelling.py) whose complete labellings partition those
+    of the semantics; the most connected arguments are fixed first, and combinations
+    that propagation already rules out are dropped
+    """
+    n = len(succ)
+    dom = [ANY] * n
+    if semantics == STABLE:
+        dom = [ANY & ~UNDEC_BIT] * n
+    checked = [True] * n
+    if not labelling.propagate(succ, pred, dom, checked, xrange(n)):
+        return []
+    domains = [dom]
+    for x in labelling.branching_order(succ, pred):
+        if len(domains) >= count:
+            break
+        split = []
+        for dom in domains:
+            if not dom[x] & (dom[x] - 1):
+                split.append(dom)
+                continue
+            for label in (IN_BIT, OUT_BIT, UNDEC_BIT):
+                if dom[x] & label:
+                    child = list(dom)
+                    child[x] = label
+                    if labelling.propagate(succ, pred, child, checked, [x] + succ[x]):
+                        split.append(child)
+        domains = split
+    return domains
+
+# The IN masks of the complete labellings within a domain, only maximal ones for preferred
+def _labelling_job(job):
+    succ, pred, dom, semantics = job
+    masks = [labelling.in_mask(labels) for labels in labelling.search(succ, pred, dom)]
+    if semantics == PREFERRED:
+        keep = antichain.maximal_masks(masks)
+        masks = [mask for mask in masks if mask in keep]
+    return masks
+
+# IN masks of the complete, stable or preferred extensions
+def iter_extension_masks(succ, pred, semantics, processes = None):
+    count = process_count(processes) * JOBS_PER_PROCESS
+    jobs = [(succ, pred, dom, semantics) for dom in split_domains(succ, pred, semantics, count)]
+    results = run_jobs(_labelling_job, jobs, processes)
+    if semantics != PREFERRED:
+        for masks in results:
+            for mask in masks:
+                yield mask
+        return
+    # a part's maximal extension may sit inside one from another part
+    candidates = [mask for masks in results for mask in masks]
+    keep = antichain.maximal_masks(candidates)
+    for mask in candidates:
+        if mask in keep:
+            yield mask
@@ -0,0 +1,110 @@
+"""
+Parity reachability: which arguments can be reached from an argument along attacks by a
+sequence of odd length, and which by one of even length
+
+Dung (1995) defines indirect attack and defence by sequences A0, A1, ..., An of arguments
+where each attacks the next, with n odd (attack) or even (defence); arguments may repeat.
+Such sequences are walks in the doubled graph whose nodes are (argument, parity) and whose
+edges are (a, p) --> (b, 1 - p) for every attack (a, b). A breadth-first search from
+(a, 0) finds a shortest such sequence, see parity_walk.
+
+ParityIndex answers "odd / even sequence from a to b?" by a bit test, after one pass over
+the doubled graph: its strongly connected components
+are found (see scc.py), and every component gets the bitset of the components it reaches,
+built in reverse topological order. That costs O(|A| + |R|) set operations on bitsets
+of up to 2 |A| bits, so O(|A| (|A| + |R|) / 64) machine words of work and O(|A|^2) bits.
+Only the attacks are needed, as succ[v], the indices of the arguments v attacks.
+"""
+
+from collections import deque
+
+from scc import strongly_connected_components
+
+EVEN = 0
+ODD = 1
+
+# Breadth-first search of the doubled graph from (source, EVEN)
+def _search(succ, source, target):
+    """
+    Output: dict of the states (index, parity) reached --> the state before them on a
+    shortest sequence (None for the start); stops early once target is reached
+    """
+    parent = {(source, EVEN): None}
+    queue = deque([(source, EVEN)])
+    while queue:
+        state = queue.popleft()
+        if state == target:
+            break
+        v, parity = state
+        for w in succ[v]:
+            following = (w, 1 - parity)
+            if following not in parent:
+                parent[following] = state
+                queue.append(following)
+    return parent
+
+# A shortest sequence of the given parity from source to target
+def parity_walk(succ, source, target, parity):
+    """
+    Output: list of indices source, ..., target, each attacking the next, whose number of
+    attacks has the given parity (ODD or EVEN), or None if there is none
+    A shortest sequence may repeat arguments when no simple one has the right parity
+    """
+    parent = _search(succ, source, (target, parity))
+    state = (target, parity)
+    if state not in parent:
+        return None
+    answer = []
+    while state is not None:
+        answer.append(state[0])
+        state = parent[state]
+    answer.reverse()
+    return answer
+
+# Parity reachability between all pairs of arguments, for repeated queries
+class ParityIndex(object):
+
+    def __init__(self, succ):
+        n = len(succ)
+        self.n = n
+        # doubled graph: node 2 v + p is (v, p)
+        doubled = [None] * (2 * n)
+        for v in xrange(n):
+            doubled[2 * v] = [2 * w + 1 for w in succ[v]]
+            doubled[2 * v + 1] = [2 * w for w in succ[v]]
+        components = strongly_connected_components(doubled)
+        self.component = [0] * (2 * n)
+        for c, members in enumerate(components):
+            for x in members:
+                self.component[x] = c
+        # reach[c] = bitset of the components reachable from component c, c included;
+        # attacks go from earlier components to later ones, so later ones are done first
+        self.reach = [0] * len(components)
+        for c in xrange(len(components) - 1, -1, -1):
+            mask = 1 << c
+            for x in components[c]:
+                for y in doubled[x]:
+                    if self.component[y] != c:
+                        mask |= self.reach[self.component[y]]
+            self.reach[c] = mask
+
+    # Is there a sequence with the given parity (ODD or EVEN) from source to target?
+    def reaches(self, source, target, parity):
+        return self.reach[self.component[2 * source]] >> self.component[2 * target + parity] & 1 == 1
+
+    # The arguments reached from source by odd and by even sequences
+    def parity_reach(self, source):
+        """
+        Output: (odd, even), two lists of booleans indexed like succ; even[source] is True
+        because of the sequence of length 0
+        """
+        mask = self.reach[self.component[2 * source]]
+        component = self.component
+        odd = [mask >> component[2 * v + ODD] & 1 == 1 for v in xrange(self.n)]
+        even = [mask >> component[2 * v + EVEN] & 1 == 1 for v in xrange(self.n)]
+        return odd, even
+
+    # Is some argument both odd and even reachable from source, i.e. is source controversial?
+    def controversial_from(self, source):
+        odd, even = self.parity_reach(source)
+        return any(o and e for o, e in zip(odd, even))
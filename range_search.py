@@ -0,0 +1,86 @@
+"""
+Range-maximisation search for semi-stable and stage semantics
+
+The range of a set S is S U S^+. Semi-stable extensions are the complete extensions, and
+stage extensions the conflict free sets, whose range is subset-maximal. Instead of listing
+every candidate and filtering the ranges afterwards, one depth-first search keeps an
+antichain (see antichain.py) of the maximal ranges found so far, and abandons a branch
+as soon as an upper bound on the range of everything below it is strictly inside one of
+them, since nothing below can then have a maximal range. The branches that make the range
+larger are tried first, so large ranges are found early and prune the most.
+
+    semi-stable   labelling.search, with the bound as its prune test: an argument can
+                  only end up in the range if IN or OUT is still in its domain
+    stage         search over the arguments in turn, IN or not; the bound is the range of
+                  the arguments IN so far and of all those that can still be added.
+                  Only naive sets (maximal conflict free) are kept at the leaves, as a
+                  conflict free set that can be extended has a strictly larger range
+
+Leaves are collected with their ranges, and only those whose range is still maximal when
+the search ends are returned. The inputs and label bits are those of labelling.py.
+"""
+
+import labelling
+from csr_graph import attack_masks
+from antichain import Antichain, MAXIMAL
+from instrumentation import bump, SUBSETS_VISITED, BRANCHES_PRUNED
+
+# Mask of the arguments that may still be IN or OUT
+def _range_bound(dom):
+    answer = 0
+    for i, d in enumerate(dom):
+        if d & (labelling.IN_BIT | labelling.OUT_BIT):
+            answer |= 1 << i
+    return answer
+
+# The semi-stable labellings, i.e. complete labellings with subset-maximal range
+def semi_stable_labellings(succ, pred, stats = None):
+    """
+    Output: list of labellings (lists of label bits, one per index)
+    """
+    best = Antichain(MAXIMAL)
+    prune = lambda dom: best.strictly_dominated(_range_bound(dom))
+    leaves = []
+    for labels in labelling.search(succ, pred, stats = stats, prune = prune):
+        reach = labelling.range_mask(labels)
+        if best.add(reach) or reach in best:
+            leaves.append((reach, labels))
+    return [labels for reach, labels in leaves if reach in best]
+
+# Masks of the stage extensions, i.e. conflict free sets with subset-maximal range
+def stage_masks(succ, pred, stats = None):
+    """
+    Output: list of masks of indices, in increasing order
+    """
+    n = len(succ)
+    victims, attackers = attack_masks(succ)
+    # arguments that conflict with i, including i itself if it attacks itself
+    conflicts = [victims[i] | attackers[i] for i in xrange(n)]
+    order = [i for i in labelling.branching_order(succ, pred) if not conflicts[i] >> i & 1]
+    best = Antichain(MAXIMAL)
+    leaves = []
+    # stack of (IN mask, its range, position in order of the next argument to decide)
+    stack = [(0, 0, 0)]
+    while stack:
+        inside, reach, position = stack.pop()
+        bump(stats, SUBSETS_VISITED)
+        # the arguments still to decide that can join the IN ones
+        addable = [i for i in order[position:] if not conflicts[i] & inside]
+        bound = reach
+        for i in addable:
+            bound |= 1 << i | victims[i]
+        if best.strictly_dominated(bound):
+            bump(stats, BRANCHES_PRUNED)
+            continue
+        if not addable:
+            # naive? every argument outside conflicts with the IN ones
+            if all(conflicts[i] & inside for i in order if not inside >> i & 1):
+                if best.add(reach) or reach in best:
+                    leaves.append((reach, inside))
+            continue
+        x = addable[0]
+        following = order.index(x, position) + 1
+        # pushed in reverse, so adding x is tried first
+        stack.append((inside, reach, following))
+        stack.append((inside | 1 << x, reach | 1 << x | victims[x], following))
+    return sorted(inside for reach, inside in leaves if reach in best)
@@ -0,0 +1,133 @@
+"""
+Persistent result store: results of Absargfw queries kept in a local SQLite file, so that
+they survive the process and are shared between processes
+
+Every result is keyed by
+    the fingerprint of the AF    SHA-256 of its arguments, in the order of arguments(), and
+                                 of its sorted attacks, so the same AF has the same
+                                 fingerprint in every process, whatever order its attacks
+                                 came in; the argument order is part of it because the
+                                 lists of extensions come in powerlist order
+    the query                    method name and arguments, e.g. ('all_pref', ('sat',), ())
+and stored pickled, with the time it was last used. Beyond max_entries results (or
+max_bytes of pickled results) the least recently used ones are evicted. Reads do not write:
+the times of the results read are kept in memory and written with the next put, or every
+TOUCH_BATCH reads, or on close().
+
+Attach one with Absargfw(..., store = ResultStore("results.db")); the methods in PERSISTENT
+then look in the store after the in-memory result cache, and write what they compute to it.
+"""
+
+import time
+import sqlite3
+import hashlib
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+# Absargfw methods whose results are stored
+PERSISTENT = ("all_cf", "all_naive", "all_sd", "all_adm", "all_comp", "all_pref", "all_stab",
+              "all_semi_stab", "all_stage", "list_fp_of_d", "grounded", "ideal", "eager")
+
+# Reads whose last-used times are written together
+TOUCH_BATCH = 256
+
+# Stable fingerprint of a CSRGraph
+def fingerprint(graph):
+    names = graph.names
+    attacks = sorted([(repr(names[i]), repr(names[j])) for i, j in graph.index_edges()])
+    digest = hashlib.sha256()
+    digest.update(repr([repr(name) for name in names]).encode("utf-8"))
+    digest.update(repr(attacks).encode("utf-8"))
+    return digest.hexdigest()
+
+class ResultStore(object):
+
+    # Open (or create) the store in the file path, ":memory:" for a store in memory only
+    def __init__(self, path, max_entries = 10000, max_bytes = None, timeout = 30.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path, timeout = timeout)
+        # (fingerprint, query) --> time last read, not yet written
+        self._touched = {}
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "fingerprint TEXT NOT NULL, query TEXT NOT NULL, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, last_used REAL NOT NULL, "
+            "PRIMARY KEY (fingerprint, query))")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_lru ON results (last_used)")
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    # Returns (True, result) if stored, (False, None) otherwise, and marks it as used
+    def get(self, fingerprint, query):
+        key = repr(query)
+        row = self.connection.execute(
+            "SELECT value FROM results WHERE fingerprint = ? AND query = ?",
+            (fingerprint, key)).fetchone()
+        if row is None:
+            return False, None
+        self._touched[(fingerprint, key)] = time.time()
+        if len(self._touched) >= TOUCH_BATCH:
+            self._write_touched()
+            self.connection.commit()
+        return True, pickle.loads(bytes(row[0]))
+
+    # Write the last-used times of the results read since the last write
+    def _write_touched(self):
+        if not self._touched:
+            return
+        self.connection.executemany(
+            "UPDATE results SET last_used = ? WHERE fingerprint = ? AND query = ?",
+            [(used, fingerprint, key) for (fingerprint, key), used in self._touched.items()])
+        self._touched.clear()
+
+    # Store a result, evicting the least recently used ones if the store is full
+    def put(self, fingerprint, query, value):
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results (fingerprint, query, value, size, last_used) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (fingerprint, repr(query), sqlite3.Binary(blob), len(blob), time.time()))
+        self._touched.pop((fingerprint, repr(query)), None)
+        self._write_touched()
+        self._evict()
+        self.connection.commit()
+
+    # Drop least recently used results until the store is within its bounds
+    def _evict(self):
+        count, total = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        excess = 0
+        if self.max_entries is not None:
+            excess = count - self.max_entries
+        if excess <= 0 and (self.max_bytes is None or total <= self.max_bytes):
+            return
+        # oldest first, never the result just stored
+        rows = self.connection.execute(
+            "SELECT rowid, size FROM results ORDER BY last_used LIMIT ?", (count - 1,))
+        victims = []
+        for rowid, size in rows:
+            if len(victims) >= excess and (self.max_bytes is None or total <= self.max_bytes):
+                break
+            victims.append((rowid,))
+            total -= size
+        self.connection.executemany("DELETE FROM results WHERE rowid = ?", victims)
+
+    # Forget the results of one AF, or everything
+    def clear(self, fingerprint = None):
+        if fingerprint is None:
+            self.connection.execute("DELETE FROM results")
+        else:
+            self.connection.execute("DELETE FROM results WHERE fingerprint = ?", (fingerprint,))
+        self.connection.commit()
+
+    def close(self):
+        self._write_touched()
+        self.connection.commit()
+        self.connection.close()
@@ -0,0 +1,206 @@
+"""
+SAT-based reasoning for abstract argumentation
+
+Conflict-freeness, admissibility, completeness and stability are encoded as CNF over
+one variable x_a per argument ("a is IN"), plus for admissible and complete one variable
+o_a per argument ("a is attacked by the IN arguments"). Extensions are enumerated by
+solving and adding a clause blocking each model found, and preferred extensions are
+computed in the CEGAR style of ICCMA solvers: find an admissible set outside all the
+preferred extensions found so far, grow it until no larger admissible set exists, block
+everything below it, repeat.
+
+The bundled pure-Python CDCL solver (sat_solver.py) is the default. If PySAT
+(https://pysathq.github.io) is installed, its solvers are used instead.
+"""
+
+from sat_solver import CDCLSolver
+
+# Optional faster backend
+try:
+    from pysat.solvers import Solver as PySATBackend
+    HAVE_PYSAT = True
+except ImportError:
+    HAVE_PYSAT = False
+
+# Semantics understood by SATReasoner
+ADMISSIBLE = "admissible"
+COMPLETE = "complete"
+PREFERRED = "preferred"
+STABLE = "stable"
+GROUNDED = "grounded"
+SEMANTICS = (ADMISSIBLE, COMPLETE, PREFERRED, STABLE, GROUNDED)
+
+# PySAT solver with the interface of CDCLSolver
+class PySATSolver(object):
+
+    def __init__(self, name = "glucose3"):
+        self.solver = PySATBackend(name = name)
+        self.num_vars = 0
+        self.model = None
+
+    def new_var(self):
+        self.num_vars += 1
+        return self.num_vars
+
+    def add_clause(self, lits):
+        lits = list(lits)
+        for lit in lits:
+            self.num_vars = max(self.num_vars, abs(lit))
+        self.solver.add_clause(lits)
+        return True
+
+    def solve(self, assumptions = ()):
+        if not self.solver.solve(assumptions = list(assumptions)):
+            self.model = None
+            return False
+        self.model = set(lit for lit in self.solver.get_model() if lit > 0)
+        return True
+
+    def value(self, var):
+        return var in self.model
+
+# Best available solver
+def make_solver():
+    if HAVE_PYSAT:
+        return PySATSolver()
+    return CDCLSolver()
+
+class SATReasoner(object):
+
+    # Reasoner over an AF given by successor / predecessor index lists
+    def __init__(self, succ, pred, solver_factory = make_solver):
+        self.succ = succ
+        self.pred = pred
+        self.n = len(succ)
+        self.solver_factory = solver_factory
+
+    # x_a is variable a + 1, o_a is variable n + a + 1
+    def _x(self, a):
+        return a + 1
+
+    def _o(self, a):
+        return self.n + a + 1
+
+    # Solver loaded with the encoding of a semantics
+    def _encode(self, semantics):
+        """
+        conflict-free:  not x_a or not x_b               for every attack (a, b)
+        stable:         x_a or x_b1 or ... or x_bk        where b1, ..., bk attack a
+        attacked:       o_a <--> x_b1 or ... or x_bk      where b1, ..., bk attack a
+        admissible:     x_a --> o_b                       for every attack (b, a)
+        complete:       o_b1 and ... and o_bk --> x_a     where b1, ..., bk attack a
+        """
+        solver = self.solver_factory()
+        n = self.n
+        x = self._x
+        o = self._o
+        for var in xrange(2 * n if semantics != STABLE else n):
+            solver.new_var()
+        for a in xrange(n):
+            for b in self.succ[a]:
+                solver.add_clause([-x(a), -x(b)])
+        if semantics == STABLE:
+            for a in xrange(n):
+                solver.add_clause([x(a)] + [x(b) for b in self.pred[a]])
+            return solver
+        for a in xrange(n):
+            solver.add_clause([-o(a)] + [x(b) for b in self.pred[a]])
+            for b in self.pred[a]:
+                solver.add_clause([-x(b), o(a)])
+                solver.add_clause([-x(a), o(b)])
+            if semantics != ADMISSIBLE:
+                solver.add_clause([x(a)] + [-o(b) for b in self.pred[a]])
+        return solver
+
+    # IN arguments of the last model
+    def _extension(self, solver):
+        return [a for a in xrange(self.n) if solver.value(self._x(a))]
+
+    # Clause ruling out exactly the extension
+    def _blocking_clause(self, extension):
+        inside = set(extension)
+        return [-self._x(a) if a in inside else self._x(a) for a in xrange(self.n)]
+
+    # Enumerate the extensions of an encoded semantics, blocking each one found
+    def _enumerate(self, semantics):
+        solver = self._encode(semantics)
+        while solver.solve():
+            extension = self._extension(solver)
+            yield extension
+            if not solver.add_clause(self._blocking_clause(extension)):
+                return
+
+    # Generator of complete extensions, as lists of indices
+    def complete_extensions(self):
+        return self._enumerate(COMPLETE)
+
+    # Generator of stable extensions, as lists of indices
+    def stable_extensions(self):
+        return self._enumerate(STABLE)
+
+    # Generator of preferred extensions, as lists of indices (CEGAR)
+    def preferred_extensions(self):
+        """
+        Find a complete extension not contained in a preferred extension found so far,
+        then repeatedly ask for a complete extension strictly containing it. When there is
+        none it is preferred: report it and require every later candidate to contain an
+        argument outside it.
+        """
+        solver = self._encode(COMPLETE)
+        x = self._x
+        while solver.solve():
+            extension = self._extension(solver)
+            while True:
+                inside = set(extension)
+                outside = [a for a in xrange(self.n) if a not in inside]
+                if not outside:
+                    break
+                # the fresh variable switches on "contains something outside"
+                switch = solver.new_var()
+                solver.add_clause([-switch] + [x(a) for a in outside])
+                larger = solver.solve([x(a) for a in extension] + [switch])
+                solver.add_clause([-switch])
+                if not larger:
+                    break
+                extension = self._extension(solver)
+            yield extension
+            outside = [x(a) for a in xrange(self.n) if a not in set(extension)]
+            if not solver.add_clause(outside):
+                return
+
+    # Does a stable extension exist?
+    def stable_exists(self):
+        return self._encode(STABLE).solve()
+
+    # Is argument index a in some extension of the semantics?
+    def credulous(self, a, semantics):
+        """
+        Credulous acceptance is the same for admissible, complete and preferred
+        Grounded is the unique complete extension, so it is skeptical complete
+        """
+        if semantics == GROUNDED:
+            return self.skeptical(a, COMPLETE)
+        if semantics == STABLE:
+            return self._encode(STABLE).solve([self._x(a)])
+        return self._encode(COMPLETE).solve([self._x(a)])
+
+    # Is argument index a in every extension of the semantics?
+    def skeptical(self, a, semantics):
+        """
+        A counterexample is an extension without a: one SAT call for stable and complete
+        (the intersection of all complete extensions is the grounded extension), and
+        for preferred a CEGAR run that stops at the first preferred extension without a
+        Admissible sets always include the empty set, so nothing is skeptically admissible
+        """
+        if semantics == ADMISSIBLE:
+            return False
+        if semantics == STABLE:
+            return not self._encode(STABLE).solve([-self._x(a)])
+        if semantics in (COMPLETE, GROUNDED):
+            return not self._encode(COMPLETE).solve([-self._x(a)])
+        if not self.credulous(a, PREFERRED):
+            return False
+        for extension in self.preferred_extensions():
+            if a not in extension:
+                return False
+        return True
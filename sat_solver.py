@@ -0,0 +1,297 @@
+"""
+A small pure-Python CDCL SAT solver
+
+Conflict-driven clause learning with two watched literals, first-UIP learning,
+VSIDS-style variable activities, phase saving and Luby restarts. It is incremental:
+clauses can be added between calls to solve, and solve takes a list of assumptions,
+which is all the argumentation encodings in sat_reasoning.py need.
+
+Variables are the integers 1, 2, 3, ... and literals are +v / -v, as in DIMACS.
+"""
+
+import heapq
+
+# Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, ..., used to space out restarts
+def luby(i):
+    size = 1
+    power = 0
+    while size < i + 1:
+        power += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) // 2
+        power -= 1
+        i = i % size
+    return 2 ** power
+
+class CDCLSolver(object):
+
+    # conflicts between restarts are RESTART_BASE times the Luby sequence
+    RESTART_BASE = 100
+
+    def __init__(self):
+        self.num_vars = 0
+        # index 0 is unused, so variables index these lists directly
+        self.assign = [0]       # 1 true, -1 false, 0 unassigned
+        self.level = [0]
+        self.reason = [None]    # index of the clause that implied the variable
+        self.activity = [0.0]
+        self.phase = [-1]       # last value, reused when branching
+        self.clauses = []
+        self.watches = {}       # literal --> indices of the clauses watching it
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.heap = []
+        self.var_inc = 1.0
+        self.ok = True
+        self.model = None
+
+    # Create a fresh variable
+    def new_var(self):
+        self.num_vars += 1
+        self.assign.append(0)
+        self.level.append(0)
+        self.reason.append(None)
+        self.activity.append(0.0)
+        self.phase.append(-1)
+        heapq.heappush(self.heap, (0.0, self.num_vars))
+        return self.num_vars
+
+    # Make sure variables 1, ..., var exist
+    def _reserve(self, var):
+        while self.num_vars < var:
+            self.new_var()
+
+    # Value of a literal, 1 true, -1 false, 0 unassigned
+    def _value(self, lit):
+        if lit > 0:
+            return self.assign[lit]
+        return -self.assign[-lit]
+
+    # Add a clause (an iterable of literals), returns False if the formula became unsatisfiable
+    def add_clause(self, lits):
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        clause = []
+        for lit in lits:
+            self._reserve(abs(lit))
+            if -lit in clause:
+                return True
+            value = self._value(lit)
+            if value == 1:
+                return True
+            if value == 0 and lit not in clause:
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+            return False
+        if len(clause) == 1:
+            self._enqueue(clause[0], None)
+            if self._propagate() is not None:
+                self.ok = False
+                return False
+            return True
+        self._attach(clause)
+        return True
+
+    # Is the formula satisfiable together with the assumptions (a list of literals)?
+    def solve(self, assumptions = ()):
+        self.model = None
+        if not self.ok:
+            return False
+        for lit in assumptions:
+            self._reserve(abs(lit))
+        self._cancel_until(0)
+        conflicts = 0
+        restarts = 0
+        limit = self.RESTART_BASE * luby(0)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, backjump = self._analyse(conflict)
+                self._cancel_until(backjump)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._enqueue(learnt[0], self._attach(learnt))
+                self.var_inc /= 0.95
+                continue
+            if conflicts >= limit:
+                restarts += 1
+                conflicts = 0
+                limit = self.RESTART_BASE * luby(restarts)
+                self._cancel_until(0)
+                continue
+            level = len(self.trail_lim)
+            if level < len(assumptions):
+                # the assumptions are decided first, one per level
+                lit = assumptions[level]
+                value = self._value(lit)
+                if value == -1:
+                    self._cancel_until(0)
+                    return False
+                self.trail_lim.append(len(self.trail))
+                if value == 0:
+                    self._enqueue(lit, None)
+                continue
+            var = self._pick_branch()
+            if var is None:
+                self.model = list(self.assign)
+                self._cancel_until(0)
+                return True
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(var if self.phase[var] == 1 else -var, None)
+
+    # Truth value of a variable in the last model
+    def value(self, var):
+        return self.model[var] == 1
+
+    # Last model as the list of true literals
+    def get_model(self):
+        return [var if self.model[var] == 1 else -var for var in xrange(1, self.num_vars + 1)]
+
+    """
+    Internals
+    """
+
+    def _attach(self, clause):
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches.setdefault(clause[0], []).append(index)
+        self.watches.setdefault(clause[1], []).append(index)
+        return index
+
+    def _enqueue(self, lit, reason):
+        var = abs(lit)
+        self.assign[var] = 1 if lit > 0 else -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    # Unit propagation, returns the index of a conflicting clause or None
+    def _propagate(self):
+        trail = self.trail
+        clauses = self.clauses
+        watches = self.watches
+        assign = self.assign
+        while self.qhead < len(trail):
+            false_lit = -trail[self.qhead]
+            self.qhead += 1
+            watching = watches.get(false_lit)
+            if not watching:
+                continue
+            kept = []
+            i = 0
+            while i < len(watching):
+                index = watching[i]
+                i += 1
+                clause = clauses[index]
+                # keep the false literal in position 1
+                if clause[0] == false_lit:
+                    clause[0] = clause[1]
+                    clause[1] = false_lit
+                first = clause[0]
+                first_value = assign[first] if first > 0 else -assign[-first]
+                if first_value == 1:
+                    kept.append(index)
+                    continue
+                # look for another literal to watch
+                moved = False
+                for k in xrange(2, len(clause)):
+                    lit = clause[k]
+                    if (assign[lit] if lit > 0 else -assign[-lit]) != -1:
+                        clause[1] = lit
+                        clause[k] = false_lit
+                        watches.setdefault(lit, []).append(index)
+                        moved = True
+                        break
+                if moved:
+                    continue
+                kept.append(index)
+                if first_value == -1:
+                    kept.extend(watching[i:])
+                    watches[false_lit] = kept
+                    self.qhead = len(trail)
+                    return index
+                self._enqueue(first, index)
+            watches[false_lit] = kept
+        return None
+
+    # First-UIP conflict analysis, returns the learnt clause and the level to jump back to
+    def _analyse(self, conflict):
+        level = self.level
+        current = len(self.trail_lim)
+        seen = set()
+        learnt = [None]
+        counter = 0
+        lit = None
+        position = len(self.trail) - 1
+        clause = self.clauses[conflict]
+        while True:
+            for q in (clause if lit is None else clause[1:]):
+                var = abs(q)
+                if var not in seen and level[var] > 0:
+                    seen.add(var)
+                    self._bump(var)
+                    if level[var] == current:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while abs(self.trail[position]) not in seen:
+                position -= 1
+            lit = self.trail[position]
+            position -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.clauses[self.reason[abs(lit)]]
+        learnt[0] = -lit
+        if len(learnt) == 1:
+            return learnt, 0
+        # watch the literal with the highest level after the asserting one
+        best = max(xrange(1, len(learnt)), key = lambda k: level[abs(learnt[k])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, level[abs(learnt[1])]
+
+    def _bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            # rescale everything, and rebuild the heap with the new values
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-self.activity[v], v) for v in xrange(1, self.num_vars + 1) if self.assign[v] == 0]
+            heapq.heapify(self.heap)
+        elif self.assign[var] == 0:
+            heapq.heappush(self.heap, (-self.activity[var], var))
+
+    # Unassigned variable of highest activity, or None if everything is assigned
+    def _pick_branch(self):
+        heap = self.heap
+        while heap:
+            activity, var = heapq.heappop(heap)
+            if self.assign[var] == 0:
+                return var
+        return None
+
+    def _cancel_until(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        start = self.trail_lim[level]
+        for k in xrange(len(self.trail) - 1, start - 1, -1):
+            var = abs(self.trail[k])
+            self.phase[var] = self.assign[var]
+            self.assign[var] = 0
+            self.reason[var] = None
+            heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+        if len(self.heap) > 10 * (self.num_vars + 1):
+            self.heap = [(-self.activity[v], v) for v in xrange(1, self.num_vars + 1) if self.assign[v] == 0]
+            heapq.heapify(self.heap)
@@ -0,0 +1,177 @@
+"""
+SCC-recursive evaluation of complete, preferred, stable and grounded semantics
+
+In the style of Baroni, Giacomin and Guida (2005): the attack graph is condensed into its
+strongly connected components, which are solved one at a time in topological order.
+Only the labels of the arguments attacking a component from outside matter to it, so
+each component is solved as a small labelling problem (see labelling.py) in which those
+attackers are fixed to the labels already chosen upstream. The labellings of the
+components are then combined, depth first, into labellings of the whole AF:
+    complete:  every complete labelling of each conditioned component
+    stable:    the same, without UNDEC
+    preferred: the complete labellings of each conditioned component with maximal IN sets
+    grounded:  the labels forced by propagation in each conditioned component, the rest UNDEC
+Components that see the same upstream labels are solved once. Solved components can be
+kept in a store between calls, keyed by their arguments: a change to the AF only affects
+the components downstream of it, so everything upstream is reused (see Absargfw.add_attack).
+"""
+
+import labelling
+import antichain
+from labelling import IN_BIT, OUT_BIT, UNDEC_BIT, ANY
+
+COMPLETE = "complete"
+PREFERRED = "preferred"
+STABLE = "stable"
+GROUNDED = "grounded"
+
+# Strongly connected components, upstream components first
+def strongly_connected_components(succ):
+    """
+    Input: successor lists
+    Output: list of components (lists of indices) in topological order, i.e. every
+    attack between two different components goes from an earlier one to a later one
+    Iterative version of Tarjan's algorithm, which finds the components sinks first
+    """
+    n = len(succ)
+    index = [None] * n
+    lowlink = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    counter = 0
+    for root in xrange(n):
+        if index[root] is not None:
+            continue
+        # work stack of (node, position in its successor list)
+        work = [(root, 0)]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            v, position = work[-1]
+            if position < len(succ[v]):
+                work[-1] = (v, position + 1)
+                w = succ[v][position]
+                if index[w] is None:
+                    index[w] = lowlink[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w] and index[w] < lowlink[v]:
+                    lowlink[v] = index[w]
+                continue
+            work.pop()
+            if work and lowlink[v] < lowlink[work[-1][0]]:
+                lowlink[work[-1][0]] = lowlink[v]
+            if lowlink[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(component)
+    components.reverse()
+    return components
+
+# One component, with its external attackers, as a small labelling problem
+class Component(object):
+
+    def __init__(self, members, succ, pred, semantics, names):
+        self.members = sorted(members)
+        self.semantics = semantics
+        inside = set(self.members)
+        self.external = sorted(set(y for x in self.members for y in pred[x] if y not in inside))
+        self.member_names = [names[x] for x in self.members]
+        self.external_names = [names[y] for y in self.external]
+        # local indices: members first, then external attackers
+        nodes = self.members + self.external
+        local = dict((v, k) for k, v in enumerate(nodes))
+        self.succ = [[local[w] for w in succ[v] if w in inside] for v in nodes]
+        self.pred = [[local[y] for y in pred[x]] for x in self.members] + [[] for y in self.external]
+        self.checked = [True] * len(self.members) + [False] * len(self.external)
+        self.trivial = len(self.members) == 1 and self.members[0] not in succ[self.members[0]]
+        self.solved = {}
+
+    # Look up the current indices of the arguments, which move when arguments are removed
+    def bind(self, index):
+        self.members = [index[name] for name in self.member_names]
+        self.external = [index[name] for name in self.external_names]
+
+    # Labellings of the members (tuples of label bits) given the labels of the external attackers
+    def solutions(self, labels):
+        key = tuple([labels[y] for y in self.external])
+        if key not in self.solved:
+            self.solved[key] = self._solve(key)
+        return self.solved[key]
+
+    def _solve(self, key):
+        if self.trivial:
+            # the label of a lone argument is determined by its attackers
+            if IN_BIT in key:
+                label = OUT_BIT
+            elif UNDEC_BIT in key:
+                label = UNDEC_BIT
+            else:
+                label = IN_BIT
+            if label == UNDEC_BIT and self.semantics == STABLE:
+                return []
+            return [(label,)]
+        m = len(self.members)
+        dom = [ANY] * m + list(key)
+        if self.semantics == STABLE:
+            dom = [d & ~UNDEC_BIT for d in dom]
+        if self.semantics == GROUNDED:
+            labelling.propagate(self.succ, self.pred, dom, self.checked, xrange(m))
+            return [tuple([d if d in (IN_BIT, OUT_BIT, UNDEC_BIT) else UNDEC_BIT for d in dom[:m]])]
+        answer = [tuple(solution[:m]) for solution in labelling.search(self.succ, self.pred, dom, self.checked)]
+        if self.semantics == PREFERRED:
+            ins = [labelling.in_mask(solution) for solution in answer]
+            keep = antichain.maximal_masks(ins)
+            answer = [solution for solution, mask in zip(answer, ins) if mask in keep]
+        return answer
+
+# Labellings of the whole AF, combined component by component
+def scc_labellings(succ, pred, semantics, names = None, store = None):
+    """
+    Input: successor and predecessor lists, one of COMPLETE, PREFERRED, STABLE, GROUNDED,
+    optionally the list of argument names and a dict of already solved components
+    (frozenset of member names --> Component), which is reused and extended
+    Output: generator of labellings (lists of label bits, one per index)
+    """
+    n = len(succ)
+    if names is None:
+        names = range(n)
+    index = dict((name, i) for i, name in enumerate(names))
+    store = {} if store is None else store
+    components = []
+    for members in strongly_connected_components(succ):
+        key = frozenset([names[x] for x in members])
+        if key in store:
+            store[key].bind(index)
+        else:
+            store[key] = Component(members, succ, pred, semantics, names)
+        components.append(store[key])
+    labels = [None] * n
+    if not components:
+        yield labels
+        return
+    # depth-first over the components, one iterator of local solutions per level
+    stack = [iter(components[0].solutions(labels))]
+    while stack:
+        depth = len(stack) - 1
+        solution = next(stack[-1], None)
+        if solution is None:
+            stack.pop()
+            continue
+        component = components[depth]
+        for x, label in zip(component.members, solution):
+            labels[x] = label
+        if depth + 1 == len(components):
+            yield list(labels)
+        else:
+            stack.append(iter(components[depth + 1].solutions(labels)))